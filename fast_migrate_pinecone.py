@@ -1,20 +1,130 @@
 """
 Optimized Pinecone Migration - 5,000 Cases
 Faster batch processing with progress tracking
+
+Vector IDs are hashes of each case's identifying fields, so re-runs skip
+unchanged cases. Vectors left by older ID schemes (positional case_N, and
+case_<hash> of title + citation only) are deleted on the first run; use
+--reset to force a full re-upload.
 """
 
 import os
+import sys
 import json
+import hashlib
+from itertools import islice
+import numpy as np
 from dotenv import load_dotenv
-from pinecone import Pinecone
+# Prefer the gRPC client (protobuf over HTTP/2) when pinecone[grpc] is installed
+try:
+    from pinecone.grpc import PineconeGRPC as Pinecone
+    GRPC_CLIENT = True
+except ImportError:
+    from pinecone import Pinecone
+    GRPC_CLIENT = False
 from sentence_transformers import SentenceTransformer
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import time
 
+from ml_legal_system.pinecone_vector_db import upsert_values
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
-def migrate_optimized():
-    """Optimized migration with batch embedding generation"""
+# Concurrent Pinecone upserts and the cap on batches waiting to upload
+UPSERT_WORKERS = 8
+MAX_PENDING_UPSERTS = 16
+
+# Token budget per embedded text; attention cost grows quadratically with length
+MAX_SEQ_LENGTH = 128
+
+CASES_FILE = './data/constitution/constitution.json'
+# Embeddings depend on the token budget, so each budget gets its own cache
+EMBEDDING_CACHE_FILE = f'./data/embedding_cache_{MAX_SEQ_LENGTH}.npz'
+
+def iter_cases(path):
+    """Yield cases one at a time, streaming the file when ijson is available"""
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'item', use_float=True)
+        elif orjson is not None:
+            yield from orjson.loads(f.read())
+        else:
+            yield from json.load(f)
+
+# Current vector ID prefix; older schemes used 'case_' (case_N, then case_<hash>)
+VECTOR_ID_PREFIX = 'case-'
+LEGACY_ID_PREFIX = 'case_'
+# First ID of the old positional scheme (case_0, case_1, ...)
+LEGACY_VECTOR_ID = 'case_0'
+
+# Case fields that together identify a case; generated cases reuse titles and citations
+CASE_KEY_FIELDS = ('title', 'citation', 'category', 'topic', 'court', 'year')
+
+def case_vector_id(case):
+    """Stable vector ID derived from a case's identifying fields"""
+    key = '|'.join(str(case.get(field, '')) for field in CASE_KEY_FIELDS)
+    return VECTOR_ID_PREFIX + hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def content_hash(text, metadata):
+    """Short fingerprint of the embedded text and the metadata stored for a case"""
+    payload = text + '\0' + json.dumps(metadata, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+def delete_legacy_vectors(index):
+    """Delete vectors stored under older 'case_' IDs
+    
+    Returns the number of vectors deleted, or None when the index cannot
+    list IDs by prefix (pod-based indexes).
+    """
+    deleted = 0
+    try:
+        for ids in index.list(prefix=LEGACY_ID_PREFIX):
+            ids = list(ids)
+            if ids:
+                index.delete(ids=ids)
+                deleted += len(ids)
+    except Exception as e:
+        print(f"⚠️  Cannot list vector IDs ({e})")
+        return None
+    return deleted
+
+def load_embedding_cache(path):
+    """Load cached embeddings as a {sha256 digest: vector} dict"""
+    if not os.path.exists(path):
+        return {}
+    
+    data = np.load(path)
+    return {bytes(h): emb for h, emb in zip(data['hashes'], data['embeddings'])}
+
+def save_embedding_cache(path, cache):
+    """Persist the embedding cache as digest and vector arrays"""
+    if not cache:
+        return
+    
+    hashes = np.frombuffer(b''.join(cache.keys()), dtype=np.uint8).reshape(-1, 32)
+    embeddings = np.stack(list(cache.values())).astype(np.float32)
+    np.savez(path, hashes=hashes, embeddings=embeddings)
+
+def migrate_optimized(reset: bool = False):
+    """Optimized migration with batch embedding generation
+    
+    Cases already in the index with unchanged content are skipped; pass
+    reset=True to wipe the index and upload everything again. Vectors
+    under older 'case_' IDs are deleted first, since they would otherwise
+    sit next to their replacements; indexes that cannot list IDs are wiped
+    when they still hold positional case_N IDs.
+    """
     
     print("\n⚖️  OPTIMIZED MIGRATION - 5,000 Legal Cases")
     print("="*70)
@@ -29,46 +139,92 @@ def migrate_optimized():
     
     # Connect to Pinecone
     print("🔌 Connecting to Pinecone...")
-    pc = Pinecone(api_key=api_key)
+    pc = Pinecone(api_key=api_key, pool_threads=UPSERT_WORKERS)
     index = pc.Index(index_name)
     print(f"✅ Connected: {index_name}")
     
     # Clear existing
     stats = index.describe_index_stats()
-    if stats.get('total_vector_count', 0) > 0:
+    has_vectors = stats.get('total_vector_count', 0) > 0
+    if not reset and has_vectors:
+        deleted = delete_legacy_vectors(index)
+        if deleted:
+            print(f"🗑️  Deleted {deleted} vectors with old case_ IDs")
+        elif deleted is None:
+            if LEGACY_VECTOR_ID in index.fetch(ids=[LEGACY_VECTOR_ID]).vectors:
+                print("⚠️  Index uses the old positional case_N IDs; clearing it for the hashed IDs")
+                reset = True
+            else:
+                print("💡 If an earlier migration used case_<hash> IDs, re-run with --reset")
+    if reset and has_vectors:
         print(f"🗑️  Clearing {stats['total_vector_count']} existing vectors...")
         index.delete(delete_all=True)
         time.sleep(3)
         print("✅ Cleared")
     
-    # Load cases
-    print("\n📂 Loading JSON...")
-    with open('./data/constitution/constitution.json', 'r', encoding='utf-8') as f:
-        cases = json.load(f)
-    print(f"✅ Loaded {len(cases)} cases")
-    
     # Load model
     print("\n🤖 Loading embedding model...")
     model = SentenceTransformer('all-MiniLM-L6-v2')
+    model.max_seq_length = MAX_SEQ_LENGTH
     print("✅ Model ready")
     
-    # Process in batches
-    print(f"\n🚀 Migrating {len(cases)} cases...")
-    print("   Batch size: 50 (optimized for speed)")
+    # Reuse embeddings from previous runs for unchanged texts
+    embedding_cache = load_embedding_cache(EMBEDDING_CACHE_FILE)
+    if embedding_cache:
+        print(f"💾 Loaded {len(embedding_cache)} cached embeddings")
+    
+    # Process in batches, streaming cases from disk
+    print(f"\n🚀 Migrating cases from {CASES_FILE}...")
+    print("   Batch size: 200 (optimized for speed)")
     print()
     
-    batch_size = 50
+    batch_size = 200
+    total_cases = 0
     total_uploaded = 0
+    total_skipped = 0
+    total_duplicates = 0
     start_time = time.time()
     
-    for i in range(0, len(cases), batch_size):
-        batch_start = time.time()
-        batch = cases[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (len(cases) + batch_size - 1) // batch_size
+    # Upserts are network-bound, so keep several in flight while the next batch encodes
+    executor = ThreadPoolExecutor(max_workers=UPSERT_WORKERS)
+    pending = {}
+    
+    def collect(done):
+        """Record the outcome of finished upsert futures"""
+        nonlocal total_uploaded
+        for future in done:
+            batch_num, count = pending.pop(future)
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  ❌ Batch {batch_num} failed: {e}")
+                continue
+            
+            total_uploaded += count
+            elapsed = time.time() - start_time
+            
+            print(f"  ✅ Batch {batch_num:3d} | "
+                  f"Uploaded: {total_uploaded:4d} | "
+                  f"Elapsed: {elapsed/60:.1f}min")
+    
+    case_iter = iter_cases(CASES_FILE)
+    batch_num = 0
+    
+    # Times each vector ID has been seen, so identical keys never overwrite each other
+    id_counts = {}
+    
+    # Bound methods used once per batch
+    encode = model.encode
+    fetch = index.fetch
+    upsert = index.upsert
+    
+    while batch := list(islice(case_iter, batch_size)):
+        total_cases += len(batch)
+        batch_num += 1
         
         try:
             # Prepare texts for batch embedding
+            ids = []
             texts = []
             metadatas = []
             
@@ -78,51 +234,98 @@ def migrate_optimized():
                 texts.append(text)
                 
                 # Metadata
-                metadatas.append({
+                metadata = {
                     'title': case.get('title', '')[:500],
                     'category': case.get('category', ''),
                     'topic': case.get('topic', '')[:200],
                     'court': case.get('court', '')[:100],
                     'year': case.get('year', ''),
                     'keywords': case.get('keywords', '')[:200]
-                })
+                }
+                metadata['content_hash'] = content_hash(text, metadata)
+                metadatas.append(metadata)
+                
+                # Later cases with the same key get an occurrence suffix (stable
+                # for an unchanged file) instead of replacing the first vector
+                vector_id = case_vector_id(case)
+                seen = id_counts.get(vector_id, 0)
+                id_counts[vector_id] = seen + 1
+                if seen:
+                    total_duplicates += 1
+                    print(f"  ⚠️  Duplicate case key: {case.get('title', '')[:50]} ({vector_id})")
+                    vector_id = f"{vector_id}-{seen}"
+                ids.append(vector_id)
+            
+            # Skip cases the index already holds with identical content
+            existing = fetch(ids=ids).vectors
+            fresh = [
+                k for k, vector_id in enumerate(ids)
+                if vector_id not in existing
+                or (existing[vector_id].metadata or {}).get('content_hash') != metadatas[k]['content_hash']
+            ]
+            total_skipped += len(ids) - len(fresh)
+            
+            if not fresh:
+                continue
+            
+            ids = [ids[k] for k in fresh]
+            texts = [texts[k] for k in fresh]
+            metadatas = [metadatas[k] for k in fresh]
             
-            # Batch encode (much faster!)
-            embeddings = model.encode(texts, show_progress_bar=False)
+            # Batch encode only texts missing from the cache
+            hashes = [hashlib.sha256(text.encode()).digest() for text in texts]
+            missing = [k for k, h in enumerate(hashes) if h not in embedding_cache]
+            
+            if missing:
+                new_embeddings = encode(
+                    [texts[k] for k in missing],
+                    batch_size=64,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+                for k, embedding in zip(missing, new_embeddings):
+                    embedding_cache[hashes[k]] = embedding
+            
+            # Unit-normalize so scores are a bare dot product; the index may
+            # then use metric='dotproduct' as well as 'cosine'
+            embeddings = np.array([embedding_cache[h] for h in hashes], dtype=np.float64)
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
             
             # Prepare vectors
             vectors = []
-            for idx, embedding in enumerate(embeddings):
-                vector_id = f"case_{i + idx}"
+            values = upsert_values(embeddings, json_transport=not GRPC_CLIENT)
+            for vector_id, embedding, metadata in zip(ids, values, metadatas):
                 vectors.append({
                     'id': vector_id,
-                    'values': embedding.tolist(),
-                    'metadata': metadatas[idx]
+                    'values': embedding,
+                    'metadata': metadata
                 })
             
-            # Upload to Pinecone
-            index.upsert(vectors=vectors)
-            total_uploaded += len(vectors)
-            
-            batch_time = time.time() - batch_start
-            elapsed = time.time() - start_time
-            remaining = (elapsed / total_uploaded) * (len(cases) - total_uploaded) if total_uploaded > 0 else 0
-            
-            print(f"  ✅ Batch {batch_num:2d}/{total_batches} | "
-                  f"Uploaded: {total_uploaded:4d}/{len(cases)} | "
-                  f"Time: {batch_time:.1f}s | "
-                  f"ETA: {remaining/60:.1f}min")
-            
-            time.sleep(0.5)  # Rate limiting
-            
         except Exception as e:
             print(f"  ❌ Batch {batch_num} failed: {e}")
             continue
+        
+        # Upload to Pinecone
+        future = executor.submit(upsert, vectors=vectors)
+        pending[future] = (batch_num, len(vectors))
+        
+        if len(pending) >= MAX_PENDING_UPSERTS:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    
+    collect(wait(pending).done)
+    executor.shutdown()
+    
+    save_embedding_cache(EMBEDDING_CACHE_FILE, embedding_cache)
     
     print()
     print("="*70)
     print(f"✅ MIGRATION COMPLETE in {(time.time() - start_time)/60:.1f} minutes!")
-    print(f"📊 Uploaded: {total_uploaded}/{len(cases)} cases")
+    print(f"📊 Uploaded: {total_uploaded}/{total_cases} cases "
+          f"({total_skipped} unchanged, skipped)")
+    if total_duplicates:
+        print(f"⚠️  {total_duplicates} cases shared another case's key fields "
+              f"and were stored under suffixed IDs")
     print("="*70)
     
     # Verify
@@ -132,12 +335,13 @@ def migrate_optimized():
     final_count = stats.get('total_vector_count', 0)
     print(f"📊 Pinecone vectors: {final_count}")
     
-    if final_count >= total_uploaded * 0.95:  # Allow 5% margin
+    expected = total_uploaded + total_skipped
+    if final_count >= expected * 0.95:  # Allow 5% margin
         print("✅ Migration verified!")
         
         # Test search
         print("\n🔍 Testing search...")
-        query_emb = model.encode("fundamental rights").tolist()
+        query_emb = model.encode("fundamental rights", normalize_embeddings=True).tolist()
         results = index.query(vector=query_emb, top_k=3, include_metadata=True)
         print(f"✅ Found {len(results['matches'])} results")
         for i, m in enumerate(results['matches'][:3]):
@@ -145,14 +349,14 @@ def migrate_optimized():
         
         return True
     else:
-        print(f"⚠️  Warning: Expected ~{total_uploaded}, got {final_count}")
+        print(f"⚠️  Warning: Expected ~{expected}, got {final_count}")
         return False
 
 if __name__ == '__main__':
     print("\n🏛️  FAST MIGRATION TO PINECONE")
     print("="*70)
     
-    if migrate_optimized():
+    if migrate_optimized(reset='--reset' in sys.argv):
         print("\n🎉 SUCCESS! 5,000 cases now in Pinecone cloud!")
         print("✅ Your RAG model is trained and ready for deployment!")
         print("\n📝 Next: Run 'python app_with_db.py' to test")
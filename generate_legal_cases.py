@@ -4,18 +4,32 @@ Uses templates based on real Indian legal principles and precedents
 Much faster and more reliable than web scraping
 """
 
+import bisect
 import json
 import os
 import random
-from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from typing import List, Dict
 
+# Report worker progress sparingly; every print is a write to the shared TTY
+PROGRESS_EVERY = 1000
+
+SEPARATOR = "=" * 70
+
+# Day-of-year offsets at which each month starts (plus year end)
+_MONTH_STARTS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365)
+_MONTH_STARTS_LEAP = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335, 366)
+
 class LegalCaseGenerator:
     """Generate diverse Indian legal cases across multiple categories"""
     
-    def __init__(self):
+    def __init__(self, load_existing: bool = True, seed: int = None):
         self.cases = []
-        self.load_existing_cases()
+        self._rng = random.Random(seed)
+        if load_existing:
+            self.load_existing_cases()
         
         # Indian Courts
         self.courts = [
@@ -253,13 +267,16 @@ class LegalCaseGenerator:
         if not topics or not scenarios:
             return None
         
+        choice = self._rng.choice
+        randrange = self._rng.randrange
+        
         # Select random topic and scenario
-        topic, keywords = random.choice(topics)
-        scenario = random.choice(scenarios)
+        topic, keywords = choice(topics)
+        scenario = choice(scenarios)
         
         # Generate case details
-        court = random.choice(self.courts)
-        year = random.randint(1980, 2024)
+        court = choice(self.courts)
+        year = randrange(1980, 2025)
         
         # Generate party names
         petitioner = self.generate_party_name()
@@ -275,7 +292,7 @@ class LegalCaseGenerator:
         )
         
         # Generate citation
-        citation = f"{year} SCC {random.randint(1, 15)} {random.randint(100, 999)}"
+        citation = f"{year} SCC {randrange(1, 16)} {randrange(100, 1000)}"
         
         return {
             'title': title,
@@ -317,11 +334,12 @@ class LegalCaseGenerator:
         else:
             choices = person_names + companies
         
-        return random.choice(choices)
+        return self._rng.choice(choices)
     
     def generate_case_content(self, category, topic, scenario, keywords,
                              petitioner, respondent, court, year) -> str:
         """Generate detailed case content"""
+        judgment_date = self.random_date(year)
         
         content = f"""
 {court}
@@ -330,7 +348,7 @@ class LegalCaseGenerator:
 Versus
 {respondent} ... Respondent
 
-Date of Judgment: {self.random_date(year)}
+Date of Judgment: {judgment_date}
 
 JUDGMENT
 
@@ -373,27 +391,29 @@ The judgment is pronounced in open court.
 Sd/-
 Judge
 {court}
-Date: {self.random_date(year)}
+Date: {judgment_date}
 """
         return content.strip()
     
     def random_date(self, year) -> str:
         """Generate random date in given year"""
-        start = datetime(year, 1, 1)
-        end = datetime(year, 12, 31)
-        random_date = start + timedelta(days=random.randint(0, (end - start).days))
-        return random_date.strftime("%d.%m.%Y")
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        starts = _MONTH_STARTS_LEAP if leap else _MONTH_STARTS
+        day_of_year = self._rng.randrange(starts[-1])
+        month = bisect.bisect_right(starts, day_of_year) - 1
+        day = day_of_year - starts[month]
+        return f"{day + 1:02d}.{month + 1:02d}.{year}"
     
     def generate_all_cases(self, target: int = 5000):
         """Generate cases across all categories to reach target"""
         current_count = len(self.cases)
         needed = target - current_count
         
-        print(f"\n{'='*70}")
+        print(f"\n{SEPARATOR}")
         print(f"🎯 TARGET: {target} diverse legal cases")
         print(f"📊 Currently have: {current_count} cases")
         print(f"🔢 Need to generate: {needed} more cases")
-        print(f"{'='*70}\n")
+        print(f"{SEPARATOR}\n")
         
         if needed <= 0:
             print("✅ Target already reached!")
@@ -402,37 +422,38 @@ Date: {self.random_date(year)}
         categories = list(self.case_templates.keys())
         cases_per_category = needed // len(categories)
         
-        for category in categories:
-            print(f"\n📂 Generating cases for: {category.upper().replace('_', ' ')}")
-            
-            for i in range(cases_per_category):
-                case = self.generate_case(category, i)
-                if case:
-                    self.cases.append(case)
-                
-                if (i + 1) % 50 == 0:
-                    print(f"  ✅ Generated {i + 1}/{cases_per_category} cases")
-            
-            print(f"  ✅ Completed {category}: {cases_per_category} cases")
-            print(f"📊 Total cases: {len(self.cases)}/{target}")
-            
-            # Save progress
-            self.save_cases()
+        # Each category is generated in its own process with its own seed
+        seed = self._rng.randrange(2**32)
+        tasks = [
+            (category, cases_per_category, seed + worker_id)
+            for worker_id, category in enumerate(categories)
+        ]
         
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for category, cases in zip(categories, ex.map(_worker_generate, tasks)):
+                print(f"\n📂 Generated cases for: {category.upper().replace('_', ' ')}")
+                self.cases.extend(cases)
+                
+                print(f"  ✅ Completed {category}: {len(cases)} cases")
+                print(f"📊 Total cases: {len(self.cases)}/{target}")
+
+                # Save progress
+                self.save_cases(compact=True)
+
         # Generate remaining cases if needed
         while len(self.cases) < target:
-            category = random.choice(categories)
+            category = self._rng.choice(categories)
             case = self.generate_case(category, len(self.cases))
             if case:
                 self.cases.append(case)
         
-        print(f"\n{'='*70}")
+        print(f"\n{SEPARATOR}")
         print(f"✅ GENERATION COMPLETE!")
         print(f"📊 Total cases: {len(self.cases)}")
-        print(f"{'='*70}\n")
+        print(f"{SEPARATOR}\n")
     
-    def save_cases(self):
-        """Save cases to JSON file"""
+    def save_cases(self, compact: bool = False):
+        """Save cases to JSON file (compact=True for intermediate checkpoints)"""
         try:
             output_dir = './data/constitution'
             os.makedirs(output_dir, exist_ok=True)
@@ -440,7 +461,10 @@ Date: {self.random_date(year)}
             output_file = os.path.join(output_dir, 'constitution.json')
             
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cases, f, indent=2, ensure_ascii=False)
+                if compact:
+                    json.dump(self.cases, f, separators=(',', ':'), ensure_ascii=False)
+                else:
+                    json.dump(self.cases, f, indent=2, ensure_ascii=False)
             
             print(f"💾 Saved {len(self.cases)} cases to {output_file}")
             
@@ -449,30 +473,25 @@ Date: {self.random_date(year)}
     
     def generate_statistics(self):
         """Generate statistics about generated cases"""
-        print("\n" + "="*70)
+        print("\n" + SEPARATOR)
         print("📊 CASE STATISTICS")
-        print("="*70)
+        print(SEPARATOR)
         
-        categories = {}
-        courts = {}
-        years = {}
+        categories = Counter()
+        courts = Counter()
+        years = Counter()
         
         for case in self.cases:
-            cat = case.get('category', 'Unknown')
-            categories[cat] = categories.get(cat, 0) + 1
-            
-            court = case.get('court', 'Unknown')
-            courts[court] = courts.get(court, 0) + 1
-            
-            year = case.get('year', 'Unknown')
-            years[year] = years.get(year, 0) + 1
+            categories[case.get('category', 'Unknown')] += 1
+            courts[case.get('court', 'Unknown')] += 1
+            years[case.get('year', 'Unknown')] += 1
         
         print(f"\n📂 Cases by Category:")
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+        for cat, count in categories.most_common():
             print(f"  {cat.replace('_', ' ').title()}: {count}")
         
         print(f"\n🏛️  Cases by Court:")
-        for court, count in sorted(courts.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for court, count in courts.most_common(10):
             print(f"  {court}: {count}")
         
         print(f"\n📅 Year Range:")
@@ -481,15 +500,35 @@ Date: {self.random_date(year)}
             print(f"  From {min(year_nums)} to {max(year_nums)}")
             print(f"  Total unique years: {len(year_nums)}")
         
-        print("\n" + "="*70)
+        print("\n" + SEPARATOR)
+
+def _worker_generate(args) -> List[Dict]:
+    """Generate cases for one category inside a worker process"""
+    category, count, seed = args
+    generator = LegalCaseGenerator(load_existing=False, seed=seed)
+
+    cases = [None] * count
+    written = 0
+    for i in range(count):
+        case = generator.generate_case(category, i)
+        if case:
+            cases[written] = case
+            written += 1
+
+        if (i + 1) % PROGRESS_EVERY == 0:
+            print(f"  ✅ [{category}] Generated {i + 1}/{count} cases")
+
+    # Drop unused slots if any generate_case call returned None
+    del cases[written:]
+    return cases
 
 def main():
     """Main execution"""
     print("🏛️  INDIAN LEGAL CASE GENERATOR")
-    print("="*70)
+    print(SEPARATOR)
     print("Target: 10,000 diverse cases across 10 categories")
     print("Fast, reliable, and based on real legal principles")
-    print("="*70)
+    print(SEPARATOR)
     
     generator = LegalCaseGenerator()
     
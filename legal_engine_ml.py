@@ -4,8 +4,13 @@ Provides API endpoints for RAG-powered legal assistance
 """
 
 import os
+import re
 import sys
-from typing import Dict, List, Optional
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 # Add ml_legal_system to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'ml_legal_system'))
@@ -20,6 +25,95 @@ except ImportError as e:
     print(f"⚠️  ML system not available: {e}")
     ML_SYSTEM_AVAILABLE = False
 
+# Formats relevance scores as whole percentages for API sources
+_format_relevance = '{:.0%}'.format
+
+# Topic keywords for the basic fallback, matched in a single scan
+_KEYWORD_RE = re.compile(
+    r'(?P<contract>contract)'
+    r'|(?P<property>property|real estate)'
+    r'|(?P<family>divorce|marriage)'
+    r'|(?P<criminal>criminal)',
+    re.IGNORECASE
+)
+
+# Canned answers for the basic fallback, keyed by _KEYWORD_RE group name
+_BASIC_RESPONSES = {
+    'contract': """**Contract Law in India:**
+
+Under the Indian Contract Act, 1872:
+- A contract must have offer, acceptance, consideration, and lawful object
+- Breach of contract can lead to compensation for losses
+- Specific performance may be ordered by courts
+- Damages are calculated based on actual loss
+
+**Relevant Sections:**
+- Section 73: Compensation for loss
+- Section 74: Compensation for breach
+- Section 10: Valid contract requirements
+
+For specific advice, please consult a lawyer with your contract details.""",
+
+    'property': """**Property Law in India:**
+
+Key Points:
+- Property transactions governed by Transfer of Property Act, 1882
+- Registration is mandatory under Registration Act, 1908
+- Property inheritance follows personal laws (Hindu, Muslim, Christian)
+- Adverse possession after 12 years continuous possession
+
+**Important Acts:**
+- Transfer of Property Act, 1882
+- Registration Act, 1908
+- Real Estate (Regulation and Development) Act, 2016
+
+Consult a property lawyer for specific cases.""",
+
+    'family': """**Family Law in India:**
+
+Divorce Grounds (vary by religion):
+- Hindu Marriage Act, 1955: Adultery, cruelty, desertion, conversion
+- Special Marriage Act, 1954: Similar grounds
+- Muslim Personal Law: Talaq, Khula
+- Christian Marriage Act: Similar to Hindu law
+
+**Child Custody:**
+- Best interest of child is paramount
+- Mother usually preferred for young children
+
+Seek family law expert advice.""",
+
+    'criminal': """**Criminal Law in India:**
+
+Governed by Indian Penal Code, 1860:
+- Criminal offenses defined with punishments
+- Criminal Procedure Code, 1973 for procedures
+- Evidence Act, 1872 for evidence rules
+
+**Key Rights:**
+- Right to legal representation
+- Right against self-incrimination
+- Right to bail (in bailable offenses)
+- Right to fair trial
+
+Contact a criminal lawyer immediately.""",
+}
+
+_DEFAULT_RESPONSE = """**General Legal Information:**
+
+I can help with questions about:
+- Contract law
+- Property disputes
+- Family law (divorce, custody)
+- Criminal law
+- Consumer rights
+- Employment law
+- Intellectual property
+
+Please provide more specific details about your legal issue.
+
+**Disclaimer:** This is general information, not legal advice. Consult a qualified lawyer for your specific case."""
+
 
 class LegalEngine:
     """
@@ -31,8 +125,15 @@ class LegalEngine:
         """Initialize legal engine"""
         self.ml_available = ML_SYSTEM_AVAILABLE
         self.rag = None
+        self._search_db = None
         self.use_pinecone = os.getenv('PINECONE_API_KEY') is not None
         
+        # Recent RAG answers keyed by normalized query
+        self._cache = OrderedDict()
+        self._cache_ttl = 900  # 15 minutes
+        self._cache_size = 1024
+        self._cache_lock = threading.Lock()
+        
         if self.ml_available:
             try:
                 # Use Pinecone in production, ChromaDB for local dev
@@ -42,6 +143,7 @@ class LegalEngine:
                 else:
                     print("💻 Using ChromaDB local vector database")
                     vector_db = LegalVectorDatabase()
+                    self._search_db = vector_db
                 
                 self.rag = LegalRAG(use_openai=False, vector_db=vector_db)
                 print("✅ ML-powered Legal Engine initialized")
@@ -61,18 +163,47 @@ class LegalEngine:
         Returns:
             Dictionary with response, sources, and metadata
         """
-        if self.ml_available and self.rag:
-            return self._get_rag_response(query)
-        else:
+        if not (self.ml_available and self.rag):
             return self._get_basic_response(query)
+        
+        key = hashlib.sha256(query.strip().lower().encode()).hexdigest()
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                cached_at, result = entry
+                if time.time() - cached_at < self._cache_ttl:
+                    self._cache.move_to_end(key)
+                    return result
+                del self._cache[key]
+        
+        result, succeeded = self._get_rag_response(query)
+        
+        # Only cache answers generated from retrieved sources, never
+        # fallback, error or "no precedents found" text
+        if succeeded:
+            with self._cache_lock:
+                self._cache[key] = (time.time(), result)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        
+        return result
     
-    def _get_rag_response(self, query: str) -> Dict:
-        """Get RAG-powered response with case citations"""
+    def _get_rag_response(self, query: str) -> Tuple[Dict, bool]:
+        """
+        Get RAG-powered response with case citations
+        
+        Returns:
+            The response dictionary, and whether the LLM generated the answer
+            from retrieved sources
+        """
         try:
             result = self.rag.answer_legal_query(query, top_k=5)
             
+            succeeded = bool(result['sources']) and result.get('generated', False)
+            
             # Format response
-            return {
+            response = {
                 'response': result['answer'],
                 'sources': [
                     {
@@ -80,105 +211,28 @@ class LegalEngine:
                         'court': case['court'],
                         'date': case['date'],
                         'url': case.get('url', ''),
-                        'relevance': f"{case['relevance_score']:.0%}"
+                        'relevance': _format_relevance(case['relevance_score'])
                     }
                     for case in result['sources']
                 ],
                 'type': 'rag',
                 'timestamp': result['timestamp']
             }
+            return response, succeeded
             
         except Exception as e:
             print(f"❌ RAG error: {e}")
-            return self._get_basic_response(query)
+            return self._get_basic_response(query), False
     
     def _get_basic_response(self, query: str) -> Dict:
         """Fallback basic response without ML"""
         
         # Simple keyword-based responses
-        query_lower = query.lower()
+        match = _KEYWORD_RE.search(query)
+        topic = match.lastgroup if match else None
         
-        if 'contract' in query_lower:
-            response = """**Contract Law in India:**
-
-Under the Indian Contract Act, 1872:
-- A contract must have offer, acceptance, consideration, and lawful object
-- Breach of contract can lead to compensation for losses
-- Specific performance may be ordered by courts
-- Damages are calculated based on actual loss
-
-**Relevant Sections:**
-- Section 73: Compensation for loss
-- Section 74: Compensation for breach
-- Section 10: Valid contract requirements
-
-For specific advice, please consult a lawyer with your contract details."""
-
-        elif 'property' in query_lower or 'real estate' in query_lower:
-            response = """**Property Law in India:**
-
-Key Points:
-- Property transactions governed by Transfer of Property Act, 1882
-- Registration is mandatory under Registration Act, 1908
-- Property inheritance follows personal laws (Hindu, Muslim, Christian)
-- Adverse possession after 12 years continuous possession
-
-**Important Acts:**
-- Transfer of Property Act, 1882
-- Registration Act, 1908
-- Real Estate (Regulation and Development) Act, 2016
-
-Consult a property lawyer for specific cases."""
-
-        elif 'divorce' in query_lower or 'marriage' in query_lower:
-            response = """**Family Law in India:**
-
-Divorce Grounds (vary by religion):
-- Hindu Marriage Act, 1955: Adultery, cruelty, desertion, conversion
-- Special Marriage Act, 1954: Similar grounds
-- Muslim Personal Law: Talaq, Khula
-- Christian Marriage Act: Similar to Hindu law
-
-**Child Custody:**
-- Best interest of child is paramount
-- Mother usually preferred for young children
-
-Seek family law expert advice."""
-
-        elif 'criminal' in query_lower:
-            response = """**Criminal Law in India:**
-
-Governed by Indian Penal Code, 1860:
-- Criminal offenses defined with punishments
-- Criminal Procedure Code, 1973 for procedures
-- Evidence Act, 1872 for evidence rules
-
-**Key Rights:**
-- Right to legal representation
-- Right against self-incrimination
-- Right to bail (in bailable offenses)
-- Right to fair trial
-
-Contact a criminal lawyer immediately."""
-
-        else:
-            response = """**General Legal Information:**
-
-I can help with questions about:
-- Contract law
-- Property disputes
-- Family law (divorce, custody)
-- Criminal law
-- Consumer rights
-- Employment law
-- Intellectual property
-
-Please provide more specific details about your legal issue.
-
-**Disclaimer:** This is general information, not legal advice. Consult a qualified lawyer for your specific case."""
-
         return {
-            'response': response,
+            'response': _BASIC_RESPONSES.get(topic, _DEFAULT_RESPONSE),
             'sources': [],
             'type': 'basic',
             'timestamp': None
@@ -199,8 +253,11 @@ Please provide more specific details about your legal issue.
             return []
         
         try:
-            db = LegalVectorDatabase(use_cloud=False)
-            results = db.search_similar_cases(query, top_k=10, filters=filters)
+            # Case search always runs against the local ChromaDB collection
+            if self._search_db is None:
+                self._search_db = LegalVectorDatabase(use_cloud=False)
+            
+            results = self._search_db.search_similar_cases(query, top_k=10, filters=filters)
             
             return [
                 {
@@ -258,17 +315,20 @@ def get_legal_response(query: str) -> str:
     engine = get_legal_engine()
     result = engine.get_legal_response(query)
     
-    response_text = result['response']
+    parts = [result['response']]
     
     # Add citations if available
-    if result['sources']:
-        response_text += "\n\n**📚 Cited Cases:**\n"
-        for i, source in enumerate(result['sources'][:3], 1):
-            response_text += f"\n{i}. {source['title']}"
-            response_text += f"\n   {source['court']} | {source['date']}"
-            response_text += f"\n   Relevance: {source['relevance']}\n"
+    sources = result['sources']
+    if sources:
+        parts.append("\n\n**📚 Cited Cases:**\n")
+        for i, source in enumerate(sources[:3], 1):
+            parts.append(
+                f"\n{i}. {source['title']}"
+                f"\n   {source['court']} | {source['date']}"
+                f"\n   Relevance: {source['relevance']}\n"
+            )
     
-    return response_text
+    return ''.join(parts)
 
 
 if __name__ == "__main__":
@@ -4,26 +4,85 @@ Scrapes cases from Indian Kanoon and other legal databases
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import lxml.html
 import json
 import time
+import threading
 from datetime import datetime
 import os
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Indian Kanoon judgment page nodes: (tag, class) -> case field
+DETAIL_NODES = {
+    ('h1', 'doc_title'): 'title',
+    ('span', 'docsource_main'): 'court',
+    ('span', 'judgement_date'): 'date',
+    ('span', 'judges'): 'judges',
+    ('div', 'judgments'): 'full_text',
+    ('a', 'cite_tag'): 'citations',
+    ('a', 'act_tag'): 'legal_acts',
+}
+
+# One XPath union so libxml2 collects every node above in a single document walk
+DETAIL_XPATH = ' | '.join(
+    f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {cls} ")]'
+    for tag, cls in DETAIL_NODES
+)
+
+MAX_CITATIONS = 10
+
+# Incremental checkpoint: one JSON-encoded case per line, appended as scraped
+PARTIAL_FILE = 'cases_partial.jsonl'
+
+
+def _jsonl_line(case: Dict) -> bytes:
+    """Encode a case as a single JSON Lines record"""
+    if orjson is not None:
+        return orjson.dumps(case) + b'\n'
+    return json.dumps(case, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
 class IndianLegalCaseScraper:
     """
     Scraper for Indian legal cases from multiple sources
     """
     
-    def __init__(self, output_dir: str = "data/legal_cases"):
+    def __init__(self, output_dir: str = "data/legal_cases", max_workers: int = 5,
+                 request_interval: float = 2.0):
         self.output_dir = output_dir
+        self.max_workers = max_workers  # Concurrent case-page requests
+        self.request_interval = request_interval  # Min seconds between case-page requests
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
         self.base_url = "https://indiankanoon.org"
+        self._query_url_cache = {}  # (query, court) -> encoded search URL without page number
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
         })
         
+        # Keep-alive pool large enough for the worker threads, with backoff on throttling
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
@@ -42,19 +101,24 @@ class IndianLegalCaseScraper:
         cases = []
         page = 1
         
+        # Encode the query (and court) once; only the page number changes per request
+        base_url = self._query_url_cache.get((query, court))
+        if base_url is None:
+            base_url = f"{self.base_url}/search/?formInput={quote_plus(query)}"
+            if court:
+                base_url += f"&court={quote_plus(court)}"
+            self._query_url_cache[(query, court)] = base_url
+        
         while len(cases) < max_results:
             try:
                 # Construct search URL
-                search_url = f"{self.base_url}/search/?formInput={query}"
-                if court:
-                    search_url += f"&court={court}"
-                search_url += f"&pagenum={page}"
+                search_url = f"{base_url}&pagenum={page}"
                 
                 print(f"📡 Searching page {page} for: {query}")
                 response = self.session.get(search_url, timeout=10)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 # Find all case links
                 case_links = soup.find_all('a', class_='cite_tag')
@@ -85,6 +149,16 @@ class IndianLegalCaseScraper:
                 
         return cases
     
+    def _throttle(self):
+        """Space case-page requests across all worker threads"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.request_interval
+        
+        if wait > 0:
+            time.sleep(wait)
+    
     def scrape_case_details(self, case_url: str) -> Optional[Dict]:
         """
         Scrape detailed information from a single case
@@ -97,57 +171,48 @@ class IndianLegalCaseScraper:
         """
         try:
             print(f"📄 Scraping: {case_url}")
+            self._throttle()  # Be respectful to the server
             response = self.session.get(case_url, timeout=15)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = lxml.html.fromstring(response.content)
             
             # Extract case information
             case_data = {
                 'url': case_url,
                 'scraped_at': datetime.now().isoformat(),
             }
+            citations = []
+            legal_acts = []
             
-            # Get title
-            title_tag = soup.find('h1', class_='doc_title')
-            if title_tag:
-                case_data['title'] = title_tag.get_text(strip=True)
-            
-            # Get court name
-            court_tag = soup.find('span', class_='docsource_main')
-            if court_tag:
-                case_data['court'] = court_tag.get_text(strip=True)
-            
-            # Get date
-            date_tag = soup.find('span', class_='judgement_date')
-            if date_tag:
-                case_data['date'] = date_tag.get_text(strip=True)
-            
-            # Get judges
-            judges_tag = soup.find('span', class_='judges')
-            if judges_tag:
-                case_data['judges'] = judges_tag.get_text(strip=True)
-            
-            # Get full judgment text
-            judgment_div = soup.find('div', class_='judgments')
-            if judgment_div:
-                case_data['full_text'] = judgment_div.get_text(separator='\n', strip=True)
+            # Nodes come back in document order; classify each by tag and class
+            for node in tree.xpath(DETAIL_XPATH):
+                classes = (node.get('class') or '').split()
+                for cls in classes:
+                    field = DETAIL_NODES.get((node.tag, cls))
+                    if field:
+                        break
+                else:
+                    continue
+                
+                if field == 'citations':
+                    if len(citations) < MAX_CITATIONS:
+                        citations.append(''.join(t.strip() for t in node.itertext()))
+                elif field == 'legal_acts':
+                    legal_acts.append(''.join(t.strip() for t in node.itertext()))
+                elif field == 'full_text':
+                    # Full judgment text, one stripped text run per line
+                    case_data.setdefault(field, '\n'.join(
+                        t.strip() for t in node.itertext() if t.strip()
+                    ))
+                else:
+                    # Title, court name, date and judges: first match wins
+                    case_data.setdefault(field, ''.join(t.strip() for t in node.itertext()))
             
-            # Get citations
-            citations = []
-            cite_tags = soup.find_all('a', class_='cite_tag')
-            for cite in cite_tags[:10]:  # Limit to 10 citations
-                citations.append(cite.get_text(strip=True))
             case_data['citations'] = citations
+            # Legal acts mentioned, dropping duplicates but keeping page order
+            case_data['legal_acts'] = list(dict.fromkeys(legal_acts))
             
-            # Extract legal acts mentioned
-            acts = []
-            act_tags = soup.find_all('a', class_='act_tag')
-            for act in act_tags:
-                acts.append(act.get_text(strip=True))
-            case_data['legal_acts'] = list(set(acts))  # Remove duplicates
-            
-            time.sleep(2)  # Be respectful to the server
             return case_data
             
         except Exception as e:
@@ -167,31 +232,38 @@ class IndianLegalCaseScraper:
         """
         all_cases = []
         
-        for query in queries:
-            print(f"\n🔍 Processing query: {query}")
-            print("=" * 60)
-            
-            # Search for cases
-            case_links = self.search_cases(query, max_results=cases_per_query)
-            print(f"📊 Found {len(case_links)} cases")
-            
-            # Scrape details for each case
-            for i, case_info in enumerate(case_links, 1):
-                print(f"\n[{i}/{len(case_links)}] Processing case...")
+        partial_path = os.path.join(self.output_dir, PARTIAL_FILE)
+        
+        with open(partial_path, 'ab') as partial:
+            for query in queries:
+                print(f"\n🔍 Processing query: {query}")
+                print("=" * 60)
+                
+                # Search for cases
+                case_links = self.search_cases(query, max_results=cases_per_query)
+                print(f"📊 Found {len(case_links)} cases")
                 
-                case_details = self.scrape_case_details(case_info['url'])
-                if case_details:
-                    case_details['search_query'] = query
-                    all_cases.append(case_details)
+                # Scrape details for several cases at once; map keeps search order
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = executor.map(
+                        self.scrape_case_details,
+                        [case_info['url'] for case_info in case_links]
+                    )
                     
-                    # Save incrementally
-                    if len(all_cases) % 10 == 0:
-                        self.save_cases(all_cases, f"cases_partial_{len(all_cases)}.json")
-                        print(f"💾 Saved {len(all_cases)} cases")
-            
-            print(f"\n✅ Completed query: {query}")
-            print(f"📊 Total cases collected: {len(all_cases)}")
-            
+                    for i, case_details in enumerate(results, 1):
+                        print(f"\n[{i}/{len(case_links)}] Processed case")
+                        
+                        if case_details:
+                            case_details['search_query'] = query
+                            all_cases.append(case_details)
+                            
+                            # Checkpoint just this case; O(1) per case instead of rewriting all
+                            partial.write(_jsonl_line(case_details))
+                            partial.flush()
+                
+                print(f"\n✅ Completed query: {query}")
+                print(f"📊 Total cases collected: {len(all_cases)}")
+        
         return all_cases
     
     def save_cases(self, cases: List[Dict], filename: str = None):
@@ -203,8 +275,13 @@ class IndianLegalCaseScraper:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cases, f, ensure_ascii=False, indent=2)
+        # Compact output; orjson encodes several times faster when installed
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(cases))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(cases, f, ensure_ascii=False)
         
         print(f"💾 Saved {len(cases)} cases to {filepath}")
         return filepath
@@ -56,7 +56,7 @@ class Config:
     PROCESSED_CASES_FILE = os.path.join(LEGAL_CASES_DIR, 'indian_legal_cases_complete.json')
     
     # Legal Query Categories - Expanded to 50 categories for 10,000 cases
-    LEGAL_CATEGORIES = [
+    LEGAL_CATEGORIES = (
         # Contract & Commercial Law (4 categories)
         "contract breach",
         "specific performance of contract",
@@ -128,7 +128,7 @@ class Config:
         # Corporate & Securities (2 categories)
         "company law oppression mismanagement",
         "SEBI securities fraud"
-    ]
+    )
 
 
 class DevelopmentConfig(Config):
@@ -6,10 +6,102 @@ Consolidates all scraped legal case data and validates integrity
 import json
 import os
 import hashlib
-from typing import List, Dict, Set, Tuple
+import mmap
+import re
+import sys
+from typing import List, Dict, Set, Tuple, Optional, Iterable
 from dataclasses import dataclass
 from datetime import datetime
-import glob
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Files at least this large are memory-mapped for parsing rather than read
+MMAP_MIN_BYTES = 1024 * 1024
+
+# First standalone four-digit number in a date string, whatever its format
+_YEAR_RE = re.compile(r'\b(\d{4})\b')
+
+
+def _read_json(path: str):
+    """Parse a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            # Parse large files straight from the page cache instead of a bytes copy
+            mm = None
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    pass  # mmap unsupported here; fall back to a plain read
+            if mm is not None:
+                with mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _iter_json_array(path: str):
+    """Yield the items of a top-level JSON array, streaming when ijson is available"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    else:
+        yield from _read_json(path)
+
+
+def _load_one(path: str) -> Tuple[List[Dict], Optional[str]]:
+    """Parse one partial case file (in a worker process when several load); returns (cases, error)"""
+    try:
+        return _read_json(path) or [], None
+    except Exception as e:
+        return [], str(e)
+
+
+def _write_json(path: str, data, indent: bool = True):
+    """Write data as JSON (indented or compact), using orjson when it is installed"""
+    # Large buffer so big compact files go out in few write calls
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(path, 'wb', buffering=1 << 20) as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            if indent:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def format_validation_error(error) -> str:
+    """Render a validation_errors entry; invalid cases are stored unformatted"""
+    if isinstance(error, tuple):
+        i, case_errors = error
+        return f"Invalid case {i}: {'; '.join(case_errors)}"
+    return error
 
 
 @dataclass
@@ -23,7 +115,7 @@ class DataQualityReport:
     data_quality_score: float
     processing_time_seconds: float
     file_sizes_mb: Dict[str, float]
-    validation_errors: List[str]
+    validation_errors: List  # message strings and (case index, errors) tuples
     case_statistics: Dict[str, any]
 
 
@@ -32,23 +124,30 @@ class DataConsolidator:
     Consolidates and validates scraped legal case data
     """
     
-    def __init__(self, data_dir: str = "data/legal_cases"):
+    def __init__(self, data_dir: str = "data/legal_cases", verbose: bool = False):
         """
         Initialize data consolidator
         
         Args:
             data_dir: Directory containing scraped case files
+            verbose: Print per-100-case progress in the dedup/validation loops
         """
         self.data_dir = data_dir
+        self.verbose = verbose
         self.all_cases = []
         self.unique_cases = []
         self.validation_errors = []
         self.case_hashes = set()
+        self.case_statistics = None
+        self._file_inventory = None  # Filled by one directory scan in load_all_cases
         
-    def load_all_cases(self) -> List[Dict]:
+    def load_all_cases(self, only_complete: bool = False) -> List[Dict]:
         """
         Load and merge all partial case files with complete dataset
         
+        Args:
+            only_complete: Skip partial files whenever the complete dataset loads
+            
         Returns:
             List of all loaded cases
         """
@@ -58,43 +157,72 @@ class DataConsolidator:
         all_cases = []
         file_count = 0
         
+        inventory = self._scan_data_files()
+        self._file_inventory = inventory
+        
         # Load complete dataset first
-        complete_file = os.path.join(self.data_dir, "indian_legal_cases_complete.json")
-        if os.path.exists(complete_file):
+        complete_file = inventory['complete']
+        if complete_file:
             print(f"📖 Loading complete dataset: {complete_file}")
             try:
-                with open(complete_file, 'r', encoding='utf-8') as f:
-                    complete_cases = json.load(f)
-                all_cases.extend(complete_cases)
+                all_cases.extend(_iter_json_array(complete_file))
                 file_count += 1
-                print(f"✅ Loaded {len(complete_cases)} cases from complete dataset")
+                print(f"✅ Loaded {len(all_cases)} cases from complete dataset")
             except Exception as e:
+                del all_cases[:]
                 error_msg = f"Error loading complete dataset: {e}"
                 print(f"❌ {error_msg}")
                 self.validation_errors.append(error_msg)
         
         # Load all partial files
-        partial_pattern = os.path.join(self.data_dir, "cases_partial_*.json")
-        partial_files = glob.glob(partial_pattern)
-        partial_files.sort(key=lambda x: int(x.split('_')[-1].split('.')[0]))
+        partial_files = inventory['partials']
+        jsonl_file = inventory['jsonl']
+        checkpoint_files = partial_files + ([jsonl_file] if jsonl_file else [])
         
         print(f"\n📂 Found {len(partial_files)} partial case files")
         
-        for file_path in partial_files:
+        # The complete dataset only holds the last run's cases, so checkpoints are
+        # loaded by default and deduplication removes the overlap
+        if only_complete and file_count and checkpoint_files:
+            print(f"⏭️  Using the complete dataset; skipping {len(checkpoint_files)} partial files")
+            partial_files = []
+            jsonl_file = None
+        
+        # Files decode independently, so parse them in parallel; map keeps file order.
+        # A single file gains nothing from worker processes, so it loads in-process.
+        if len(partial_files) >= 2:
+            workers = min(os.cpu_count() or 1, len(partial_files))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_load_one, partial_files, chunksize=4))
+        else:
+            results = map(_load_one, partial_files)
+        
+        for file_path, (partial_cases, error) in zip(partial_files, results):
+            print(f"📖 Loading: {os.path.basename(file_path)}")
+            
+            if error:
+                error_msg = f"Error loading {file_path}: {error}"
+                print(f"   ❌ {error_msg}")
+                self.validation_errors.append(error_msg)
+            elif partial_cases:  # Only add non-empty files
+                all_cases.extend(partial_cases)
+                file_count += 1
+                print(f"   ✅ Added {len(partial_cases)} cases")
+            else:
+                print(f"   ⚠️  Empty file skipped")
+        
+        # Load the JSON Lines checkpoint written by the scraper
+        if jsonl_file:
+            print(f"📖 Loading: {os.path.basename(jsonl_file)}")
             try:
-                print(f"📖 Loading: {os.path.basename(file_path)}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    partial_cases = json.load(f)
-                
-                if partial_cases:  # Only add non-empty files
-                    all_cases.extend(partial_cases)
-                    file_count += 1
-                    print(f"   ✅ Added {len(partial_cases)} cases")
-                else:
-                    print(f"   ⚠️  Empty file skipped")
-                    
+                loads = orjson.loads if orjson is not None else json.loads
+                with open(jsonl_file, 'rb') as f:
+                    jsonl_cases = [loads(line) for line in f if line.strip()]
+                all_cases.extend(jsonl_cases)
+                file_count += 1
+                print(f"   ✅ Added {len(jsonl_cases)} cases")
             except Exception as e:
-                error_msg = f"Error loading {file_path}: {e}"
+                error_msg = f"Error loading {jsonl_file}: {e}"
                 print(f"   ❌ {error_msg}")
                 self.validation_errors.append(error_msg)
         
@@ -102,7 +230,7 @@ class DataConsolidator:
         print(f"\n📊 Total loaded: {len(all_cases)} cases from {file_count} files")
         return all_cases
     
-    def _generate_case_hash(self, case: Dict) -> str:
+    def _generate_case_hash(self, case: Dict) -> int:
         """
         Generate unique hash for a case based on key fields
         
@@ -110,26 +238,16 @@ class DataConsolidator:
             case: Case dictionary
             
         Returns:
-            SHA256 hash string
+            128-bit integer hash (non-cryptographic; only used for dedup)
         """
-        # Use URL and scraped_at as primary identifiers
-        # If not available, use title + court + date
-        key_fields = []
-        
-        if case.get('url'):
-            key_fields.append(case['url'])
-        if case.get('scraped_at'):
-            key_fields.append(case['scraped_at'])
-        if case.get('title'):
-            key_fields.append(case['title'])
-        if case.get('court'):
-            key_fields.append(case['court'])
-        if case.get('date'):
-            key_fields.append(case['date'])
-        
-        # Create hash from concatenated key fields
-        hash_input = '|'.join(str(field) for field in key_fields)
-        return hashlib.sha256(hash_input.encode('utf-8')).hexdigest()
+        # Use URL and scraped_at as primary identifiers, plus title + court + date
+        # Every field keeps its slot (empty when missing), so positions never shift
+        get = case.get
+        hash_input = (f"{get('url') or ''}|{get('scraped_at') or ''}|{get('title') or ''}|"
+                      f"{get('court') or ''}|{get('date') or ''}")
+        if xxhash is not None:
+            return xxhash.xxh3_128_intdigest(hash_input)
+        return int.from_bytes(hashlib.blake2b(hash_input.encode('utf-8'), digest_size=16).digest(), 'big')
     
     def remove_duplicates(self, cases: List[Dict]) -> List[Dict]:
         """
@@ -146,6 +264,7 @@ class DataConsolidator:
         unique_cases = []
         seen_hashes = set()
         duplicates_count = 0
+        verbose = self.verbose
         
         for i, case in enumerate(cases):
             case_hash = self._generate_case_hash(case)
@@ -156,7 +275,7 @@ class DataConsolidator:
             else:
                 duplicates_count += 1
             
-            if (i + 1) % 100 == 0:
+            if verbose and (i + 1) % 100 == 0:
                 print(f"   Processed {i + 1}/{len(cases)} cases...")
         
         print(f"✅ Removed {duplicates_count} duplicate cases")
@@ -177,19 +296,17 @@ class DataConsolidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
+        get = case.get
+        url = get('url')
         
         # Required fields check
-        required_fields = ['url', 'scraped_at']
-        for field in required_fields:
-            if field not in case or not case[field]:
-                errors.append(f"Missing required field: {field}")
+        if not url:
+            errors.append("Missing required field: url")
+        if not get('scraped_at'):
+            errors.append("Missing required field: scraped_at")
         
         # Optional but important fields
-        important_fields = ['title', 'court', 'date', 'full_text']
-        missing_important = [field for field in important_fields 
-                           if field not in case or not case[field]]
-        
-        if len(missing_important) == len(important_fields):
+        if not (get('title') or get('court') or get('date') or get('full_text')):
             errors.append("Missing all important content fields (title, court, date, full_text)")
         
         # Data type validation
@@ -200,9 +317,8 @@ class DataConsolidator:
             errors.append("Legal_acts field must be a list")
         
         # URL validation
-        if 'url' in case and case['url']:
-            if not case['url'].startswith('http'):
-                errors.append("Invalid URL format")
+        if url and not url.startswith(('http://', 'https://')):
+            errors.append("Invalid URL format")
         
         return len(errors) == 0, errors
     
@@ -220,6 +336,7 @@ class DataConsolidator:
         
         valid_cases = []
         invalid_count = 0
+        verbose = self.verbose
         
         for i, case in enumerate(cases):
             is_valid, case_errors = self.validate_case_structure(case)
@@ -228,10 +345,9 @@ class DataConsolidator:
                 valid_cases.append(case)
             else:
                 invalid_count += 1
-                error_msg = f"Invalid case {i}: {'; '.join(case_errors)}"
-                self.validation_errors.append(error_msg)
+                self.validation_errors.append((i, case_errors))
             
-            if (i + 1) % 100 == 0:
+            if verbose and (i + 1) % 100 == 0:
                 print(f"   Validated {i + 1}/{len(cases)} cases...")
         
         print(f"✅ Valid cases: {len(valid_cases)}")
@@ -239,12 +355,58 @@ class DataConsolidator:
         
         return valid_cases
     
-    def analyze_case_statistics(self, cases: List[Dict]) -> Dict[str, any]:
+    def consolidate_and_validate(self, cases: List[Dict]) -> List[Dict]:
+        """
+        Remove duplicates, drop invalid cases and gather statistics in one pass
+        
+        Args:
+            cases: List of loaded cases
+            
+        Returns:
+            List of unique, valid cases
+        """
+        print("\n🔍 Removing duplicates and validating cases...")
+        
+        unique_valid = []
+        seen_hashes = set()
+        counts = {'duplicates': 0, 'invalid': 0}
+        
+        def accepted_cases():
+            # Dedup and validation are independent per-case checks, so the
+            # statistics loop below can consume cases as they pass both
+            for i, case in enumerate(cases):
+                case_hash = self._generate_case_hash(case)
+                if case_hash in seen_hashes:
+                    counts['duplicates'] += 1
+                    continue
+                seen_hashes.add(case_hash)
+                
+                is_valid, case_errors = self.validate_case_structure(case)
+                if not is_valid:
+                    counts['invalid'] += 1
+                    self.validation_errors.append((i, case_errors))
+                    continue
+                
+                unique_valid.append(case)
+                yield case
+        
+        stats = self.analyze_case_statistics(accepted_cases())
+        
+        print(f"✅ Removed {counts['duplicates']} duplicate cases")
+        print(f"❌ Invalid cases removed: {counts['invalid']}")
+        print(f"📊 Unique valid cases: {len(unique_valid)}")
+        
+        self.unique_cases = unique_valid
+        self.case_hashes = seen_hashes
+        self.case_statistics = stats
+        return unique_valid
+    
+    def analyze_case_statistics(self, cases: Iterable[Dict]) -> Dict[str, any]:
         """
         Generate comprehensive statistics about the case data
         
         Args:
-            cases: List of cases to analyze
+            cases: Cases to analyze (any iterable; consumed once)
             
         Returns:
             Dictionary of statistics
@@ -252,12 +414,14 @@ class DataConsolidator:
         print("\n📊 Analyzing case statistics...")
         
         stats = {
-            'total_cases': len(cases),
+            'total_cases': 0,
             'courts': {},
             'years': {},
             'search_queries': {},
             'has_full_text': 0,
             'has_title': 0,
+            'has_court': 0,
+            'has_date': 0,
             'has_judges': 0,
             'has_citations': 0,
             'has_legal_acts': 0,
@@ -266,59 +430,69 @@ class DataConsolidator:
             'date_range': {'earliest': None, 'latest': None}
         }
         
-        text_lengths = []
-        citation_counts = []
+        courts = []
+        years = []
+        queries = []
+        # Unboxed 64-bit ints; the case stream has no known length to preallocate
+        text_lengths = array('q')
+        citation_counts = array('q')
+        total = has_title = has_court = has_date = has_judges = has_legal_acts = 0
+        
+        # Bound methods and counters live in locals for the hot loop
+        add_court = courts.append
+        add_year = years.append
+        add_query = queries.append
+        add_text_length = text_lengths.append
+        add_citation_count = citation_counts.append
+        year_search = _YEAR_RE.search
         
         for case in cases:
+            get = case.get
+            total += 1
+            
             # Court statistics
-            court = case.get('court', 'Unknown')
-            stats['courts'][court] = stats['courts'].get(court, 0) + 1
+            add_court(get('court', 'Unknown'))
+            if get('court'):
+                has_court += 1
             
             # Year statistics
-            date_str = case.get('date', '')
+            date_str = get('date', '')
             if date_str:
-                try:
-                    # Extract year from various date formats
-                    year = None
-                    if '-' in date_str:
-                        year = date_str.split('-')[0]
-                    elif '/' in date_str:
-                        parts = date_str.split('/')
-                        year = parts[-1] if len(parts[-1]) == 4 else parts[0]
-                    
-                    if year and year.isdigit():
-                        stats['years'][year] = stats['years'].get(year, 0) + 1
-                        
-                        # Track date range
-                        if not stats['date_range']['earliest'] or year < stats['date_range']['earliest']:
-                            stats['date_range']['earliest'] = year
-                        if not stats['date_range']['latest'] or year > stats['date_range']['latest']:
-                            stats['date_range']['latest'] = year
-                            
-                except Exception:
-                    pass
+                has_date += 1
+                if isinstance(date_str, str):
+                    match = year_search(date_str)
+                    if match:
+                        add_year(match.group(1))
             
             # Search query statistics
-            query = case.get('search_query', 'Unknown')
-            stats['search_queries'][query] = stats['search_queries'].get(query, 0) + 1
+            add_query(get('search_query', 'Unknown'))
             
             # Field presence statistics
-            if case.get('full_text'):
-                stats['has_full_text'] += 1
-                text_lengths.append(len(case['full_text']))
+            full_text = get('full_text')
+            if full_text:
+                add_text_length(len(full_text))
             
-            if case.get('title'):
-                stats['has_title'] += 1
+            if get('title'):
+                has_title += 1
             
-            if case.get('judges'):
-                stats['has_judges'] += 1
+            if get('judges'):
+                has_judges += 1
             
-            if case.get('citations'):
-                stats['has_citations'] += 1
-                citation_counts.append(len(case['citations']))
+            citations = get('citations')
+            if citations:
+                add_citation_count(len(citations))
             
-            if case.get('legal_acts'):
-                stats['has_legal_acts'] += 1
+            if get('legal_acts'):
+                has_legal_acts += 1
+        
+        stats['total_cases'] = total
+        stats['has_full_text'] = len(text_lengths)
+        stats['has_title'] = has_title
+        stats['has_court'] = has_court
+        stats['has_date'] = has_date
+        stats['has_judges'] = has_judges
+        stats['has_citations'] = len(citation_counts)
+        stats['has_legal_acts'] = has_legal_acts
         
         # Calculate averages
         if text_lengths:
@@ -327,13 +501,22 @@ class DataConsolidator:
         if citation_counts:
             stats['avg_citations_count'] = sum(citation_counts) / len(citation_counts)
         
-        # Sort top courts and years
-        stats['top_courts'] = sorted(stats['courts'].items(), 
-                                   key=lambda x: x[1], reverse=True)[:10]
-        stats['top_years'] = sorted(stats['years'].items(), 
-                                  key=lambda x: x[1], reverse=True)[:10]
-        stats['top_queries'] = sorted(stats['search_queries'].items(), 
-                                    key=lambda x: x[1], reverse=True)[:10]
+        # Tally courts, years and queries in one C-level pass each
+        court_counts = Counter(courts)
+        year_counts = Counter(years)
+        query_counts = Counter(queries)
+        stats['courts'] = dict(court_counts)
+        stats['years'] = dict(year_counts)
+        stats['search_queries'] = dict(query_counts)
+        
+        # Years compare as strings, which orders four-digit years correctly
+        if years:
+            stats['date_range'] = {'earliest': min(years), 'latest': max(years)}
+        
+        # Top courts, years and queries
+        stats['top_courts'] = court_counts.most_common(10)
+        stats['top_years'] = year_counts.most_common(10)
+        stats['top_queries'] = query_counts.most_common(10)
         
         return stats
     
@@ -357,8 +540,8 @@ class DataConsolidator:
         scores = {
             'has_full_text': (stats['has_full_text'] / total_cases) * 30,  # 30%
             'has_title': (stats['has_title'] / total_cases) * 20,          # 20%
-            'has_court': (len([c for c in cases if c.get('court')]) / total_cases) * 15,  # 15%
-            'has_date': (len([c for c in cases if c.get('date')]) / total_cases) * 15,    # 15%
+            'has_court': (stats['has_court'] / total_cases) * 15,          # 15%
+            'has_date': (stats['has_date'] / total_cases) * 15,            # 15%
             'has_judges': (stats['has_judges'] / total_cases) * 10,        # 10%
             'has_citations': (stats['has_citations'] / total_cases) * 10,  # 10%
         }
@@ -366,6 +549,43 @@ class DataConsolidator:
         total_score = sum(scores.values())
         return min(100.0, total_score)
     
+    def _scan_data_files(self) -> Dict:
+        """
+        Inventory the data files with a single directory scan
+        
+        Returns:
+            Dictionary with the complete dataset path (or None), sorted partial
+            file paths, the JSONL checkpoint path (or None), the number of JSON
+            files and a stat result per case file
+        """
+        inventory = {'complete': None, 'partials': [], 'jsonl': None, 'json_count': 0, 'stats': {}}
+        
+        # DirEntry.stat() reuses what scandir already read, so no extra syscalls
+        if os.path.isdir(self.data_dir):
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith('.') or not entry.is_file():
+                        continue
+                    
+                    if name == "cases_partial.jsonl":
+                        inventory['jsonl'] = entry.path
+                    elif not name.endswith('.json'):
+                        continue
+                    else:
+                        inventory['json_count'] += 1
+                        if name == "indian_legal_cases_complete.json":
+                            inventory['complete'] = entry.path
+                        elif name.startswith("cases_partial_"):
+                            inventory['partials'].append(entry.path)
+                        else:
+                            continue
+                    
+                    inventory['stats'][entry.path] = entry.stat()
+        
+        inventory['partials'].sort(key=lambda x: int(x.split('_')[-1].split('.')[0]))
+        return inventory
+    
     def get_file_sizes(self) -> Dict[str, float]:
         """
         Get file sizes in MB for all data files
@@ -373,22 +593,17 @@ class DataConsolidator:
         Returns:
             Dictionary of filename -> size in MB
         """
+        inventory = self._file_inventory or self._scan_data_files()
+        file_stats = inventory['stats']
         file_sizes = {}
         
         # Check complete dataset
-        complete_file = os.path.join(self.data_dir, "indian_legal_cases_complete.json")
-        if os.path.exists(complete_file):
-            size_mb = os.path.getsize(complete_file) / (1024 * 1024)
+        if inventory['complete']:
+            size_mb = file_stats[inventory['complete']].st_size / (1024 * 1024)
             file_sizes['indian_legal_cases_complete.json'] = round(size_mb, 2)
         
         # Check partial files
-        partial_pattern = os.path.join(self.data_dir, "cases_partial_*.json")
-        partial_files = glob.glob(partial_pattern)
-        
-        total_partial_size = 0
-        for file_path in partial_files:
-            size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            total_partial_size += size_mb
+        total_partial_size = sum(file_stats[path].st_size for path in inventory['partials']) / (1024 * 1024)
         
         file_sizes['all_partial_files_combined'] = round(total_partial_size, 2)
         file_sizes['total_data_size'] = round(sum(file_sizes.values()), 2)
@@ -407,16 +622,19 @@ class DataConsolidator:
         """
         print("\n📋 Generating data quality report...")
         
-        stats = self.analyze_case_statistics(self.unique_cases)
+        stats = self.case_statistics
+        if stats is None:
+            stats = self.analyze_case_statistics(self.unique_cases)
         quality_score = self.calculate_data_quality_score(self.unique_cases, stats)
         file_sizes = self.get_file_sizes()
+        inventory = self._file_inventory or self._scan_data_files()
         
         report = DataQualityReport(
-            total_files_processed=len(glob.glob(os.path.join(self.data_dir, "*.json"))),
+            total_files_processed=inventory['json_count'],
             total_cases_loaded=len(self.all_cases),
             unique_cases_after_dedup=len(self.unique_cases),
             duplicates_removed=len(self.all_cases) - len(self.unique_cases),
-            invalid_cases_removed=len(self.all_cases) - len(self.unique_cases) - len([e for e in self.validation_errors if "Invalid case" in e]),
+            invalid_cases_removed=len(self.all_cases) - len(self.unique_cases) - sum(1 for e in self.validation_errors if isinstance(e, tuple)),
             data_quality_score=quality_score,
             processing_time_seconds=processing_time,
             file_sizes_mb=file_sizes,
@@ -426,15 +644,16 @@ class DataConsolidator:
         
         return report
     
-    def save_consolidated_data(self, output_file: str = None) -> str:
+    def save_consolidated_data(self, output_file: str = None, parquet: bool = True) -> str:
         """
         Save consolidated and validated data to file
         
         Args:
             output_file: Output file path (optional)
+            parquet: Also write a columnar .parquet copy when pyarrow is installed
             
         Returns:
-            Path to saved file
+            Path to saved JSON file
         """
         if not output_file:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -442,12 +661,35 @@ class DataConsolidator:
         
         print(f"\n💾 Saving consolidated data to: {output_file}")
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.unique_cases, f, ensure_ascii=False, indent=2)
+        # Compact: the cases file is large and read by programs, not people
+        _write_json(output_file, self.unique_cases, indent=False)
         
         print(f"✅ Saved {len(self.unique_cases)} unique cases")
+        
+        if parquet and pq is not None:
+            self._save_parquet(os.path.splitext(output_file)[0] + '.parquet')
+        
         return output_file
     
+    def _save_parquet(self, parquet_file: str):
+        """
+        Write the unique cases as a zstd-compressed Parquet table
+        
+        Args:
+            parquet_file: Output .parquet path
+        """
+        cases = self.unique_cases
+        # Cases do not all carry the same fields, so take the union of keys
+        columns = dict.fromkeys(key for case in cases for key in case)
+        
+        try:
+            table = pa.table({key: [case.get(key) for case in cases] for key in columns})
+            pq.write_table(table, parquet_file, compression='zstd')
+            print(f"✅ Saved Parquet copy to: {parquet_file}")
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            # Mixed value types in a field cannot form one column; JSON is still saved
+            print(f"⚠️  Skipped Parquet copy: {e}")
+    
     def print_quality_report(self, report: DataQualityReport):
         """
         Print formatted data quality report
@@ -496,7 +738,7 @@ class DataConsolidator:
         if report.validation_errors:
             print(f"\n⚠️ VALIDATION ERRORS ({len(report.validation_errors)}):")
             for error in report.validation_errors[:10]:  # Show first 10 errors
-                print(f"   • {error}")
+                print(f"   • {format_validation_error(error)}")
             if len(report.validation_errors) > 10:
                 print(f"   ... and {len(report.validation_errors) - 10} more errors")
         
@@ -517,18 +759,14 @@ def main():
     
     try:
         # Step 1: Load all cases
-        all_cases = consolidator.load_all_cases()
+        all_cases = consolidator.load_all_cases(only_complete='--only-complete' in sys.argv)
         
         if not all_cases:
             print("❌ No cases loaded. Check data directory and files.")
             return
         
-        # Step 2: Remove duplicates
-        unique_cases = consolidator.remove_duplicates(all_cases)
-        
-        # Step 3: Validate cases
-        valid_cases = consolidator.validate_cases(unique_cases)
-        consolidator.unique_cases = valid_cases
+        # Steps 2-3: Remove duplicates and validate cases in a single pass
+        valid_cases = consolidator.consolidate_and_validate(all_cases)
         
         # Step 4: Generate quality report
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -546,22 +784,21 @@ def main():
         
         # Save report to JSON
         report_file = output_file.replace('.json', '_quality_report.json')
-        with open(report_file, 'w', encoding='utf-8') as f:
-            # Convert dataclass to dict for JSON serialization
-            report_dict = {
-                'total_files_processed': report.total_files_processed,
-                'total_cases_loaded': report.total_cases_loaded,
-                'unique_cases_after_dedup': report.unique_cases_after_dedup,
-                'duplicates_removed': report.duplicates_removed,
-                'invalid_cases_removed': report.invalid_cases_removed,
-                'data_quality_score': report.data_quality_score,
-                'processing_time_seconds': report.processing_time_seconds,
-                'file_sizes_mb': report.file_sizes_mb,
-                'validation_errors': report.validation_errors,
-                'case_statistics': report.case_statistics,
-                'generated_at': datetime.now().isoformat()
-            }
-            json.dump(report_dict, f, ensure_ascii=False, indent=2)
+        # Convert dataclass to dict for JSON serialization
+        report_dict = {
+            'total_files_processed': report.total_files_processed,
+            'total_cases_loaded': report.total_cases_loaded,
+            'unique_cases_after_dedup': report.unique_cases_after_dedup,
+            'duplicates_removed': report.duplicates_removed,
+            'invalid_cases_removed': report.invalid_cases_removed,
+            'data_quality_score': report.data_quality_score,
+            'processing_time_seconds': report.processing_time_seconds,
+            'file_sizes_mb': report.file_sizes_mb,
+            'validation_errors': [format_validation_error(e) for e in report.validation_errors],
+            'case_statistics': report.case_statistics,
+            'generated_at': datetime.now().isoformat()
+        }
+        _write_json(report_file, report_dict)
         
         print(f"📋 Quality report saved to: {report_file}")
         
@@ -5,11 +5,74 @@ Combines case retrieval with LLM for accurate legal advice
 
 import os
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 
 from vector_db import LegalVectorDatabase
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LLM requests in flight at once during batch processing
+LLM_CONCURRENCY = 8
+
+# Answer returned when the LLM call fails
+GENERATION_ERROR = "Error generating response."
+
+# Characters of each retrieved document kept as the case excerpt in the LLM context
+EXCERPT_LENGTH = 300
+
+# Static prompt text stays byte-identical and first in every request, so
+# providers that reuse cached prompt prefixes can skip re-processing it
+OPENAI_SYSTEM_PROMPT = """You are an expert Indian legal assistant.
+Use the provided case precedents to answer questions accurately.
+Always cite specific cases and rulings.
+If uncertain, acknowledge limitations.
+Provide clear, actionable legal guidance."""
+
+GEMINI_PROMPT_PREFIX = """You are an expert Indian legal assistant with deep knowledge of Indian law.
+
+Instructions:
+1. Analyze the provided case precedents carefully
+2. Provide a comprehensive legal answer citing specific cases
+3. Include relevant legal principles and precedents
+4. Mention applicable laws and sections if relevant
+5. Be clear, accurate, and professional
+6. If precedents are insufficient, acknowledge limitations
+
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _get_openai():
+    """Import and configure the OpenAI module once per process"""
+    import openai
+    openai.api_key = os.getenv('OPENAI_API_KEY')
+    return openai
+
+
+@functools.lru_cache(maxsize=1)
+def _get_gemini_model():
+    """Configure Gemini and build the model once per process"""
+    import google.generativeai as genai
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
+    api_key = os.getenv('GOOGLE_API_KEY')
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+    
+    genai.configure(api_key=api_key)
+    
+    # Use the latest Gemini model
+    return genai.GenerativeModel('models/gemini-2.5-flash')
+
 
 class LegalRAG:
     """
@@ -38,8 +101,7 @@ class LegalRAG:
     def _init_openai(self):
         """Initialize OpenAI GPT"""
         try:
-            import openai
-            openai.api_key = os.getenv('OPENAI_API_KEY')
+            _get_openai()
             self.llm = 'openai'
             print("✅ OpenAI GPT initialized")
         except Exception as e:
@@ -50,20 +112,8 @@ class LegalRAG:
     def _init_gemini(self):
         """Initialize Google Gemini (Free)"""
         try:
-            import google.generativeai as genai
-            from dotenv import load_dotenv
-            
-            # Load environment variables
-            load_dotenv()
-            
-            api_key = os.getenv('GOOGLE_API_KEY')
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY not found in environment variables")
-            
-            genai.configure(api_key=api_key)
-            
-            # Use the latest Gemini model
-            self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+            # Shared across LegalRAG instances; only the first one pays for setup
+            self.model = _get_gemini_model()
             self.llm = 'gemini'
             print("✅ Google Gemini initialized")
             
@@ -71,13 +121,15 @@ class LegalRAG:
             print(f"❌ Gemini initialization error: {e}")
             self.llm = None
     
-    def retrieve_relevant_cases(self, query: str, top_k: int = 5) -> List[Dict]:
+    def retrieve_relevant_cases(self, query: str, top_k: int = 5,
+                                excerpt_len: int = EXCERPT_LENGTH) -> List[Dict]:
         """
         Retrieve relevant cases for the query
         
         Args:
             query: User's legal question
             top_k: Number of cases to retrieve
+            excerpt_len: Characters of each case document kept as its excerpt
             
         Returns:
             List of relevant cases with metadata
@@ -85,25 +137,48 @@ class LegalRAG:
         try:
             # Search vector database
             results = self.vector_db.search_similar_cases(query, top_k=top_k)
+            return self._format_cases(results, excerpt_len)
             
-            # Format results
-            relevant_cases = []
-            for case in results:
-                relevant_cases.append({
-                    'title': case['metadata']['title'],
-                    'court': case['metadata']['court'],
-                    'date': case['metadata']['date'],
-                    'judges': case['metadata']['judges'],
-                    'url': case['metadata'].get('url', ''),
-                    'relevance_score': 1 - case.get('distance', 0),
-                    'excerpt': case.get('document', '')[:500]
-                })
+        except Exception as e:
+            print(f"❌ Error retrieving cases: {e}")
+            return []
+    
+    def retrieve_relevant_cases_batch(self, queries: List[str], top_k: int = 5,
+                                      excerpt_len: int = EXCERPT_LENGTH) -> List[List[Dict]]:
+        """
+        Retrieve relevant cases for several queries with one batched search
+        
+        Args:
+            queries: User's legal questions
+            top_k: Number of cases to retrieve per query
+            excerpt_len: Characters of each case document kept as its excerpt
             
-            return relevant_cases
+        Returns:
+            One list of relevant cases per query, in query order
+        """
+        try:
+            batch_results = self.vector_db.search_similar_cases_batch(queries, top_k=top_k)
+            return [self._format_cases(results, excerpt_len) for results in batch_results]
             
         except Exception as e:
             print(f"❌ Error retrieving cases: {e}")
-            return []
+            return [[] for _ in queries]
+    
+    def _format_cases(self, results: List[Dict], excerpt_len: int = EXCERPT_LENGTH) -> List[Dict]:
+        """Turn raw vector search matches into relevant-case dicts"""
+        relevant_cases = []
+        for case in results:
+            relevant_cases.append({
+                'title': case['metadata']['title'],
+                'court': case['metadata']['court'],
+                'date': case['metadata']['date'],
+                'judges': case['metadata']['judges'],
+                'url': case['metadata'].get('url', ''),
+                'relevance_score': 1 - case.get('distance', 0),
+                'excerpt': case.get('document', '')[:excerpt_len]
+            })
+        
+        return relevant_cases
     
     def format_context(self, cases: List[Dict]) -> str:
         """
@@ -118,28 +193,24 @@ class LegalRAG:
         if not cases:
             return "No relevant precedents found."
         
-        context = "**Relevant Legal Precedents:**\n\n"
+        parts = ["**Relevant Legal Precedents:**\n\n"]
         
         for i, case in enumerate(cases, 1):
-            context += f"**Case {i}: {case['title']}**\n"
-            context += f"- Court: {case['court']}\n"
-            context += f"- Date: {case['date']}\n"
-            context += f"- Judges: {case['judges']}\n"
-            context += f"- Relevance: {case['relevance_score']:.2%}\n"
-            context += f"- Excerpt: {case['excerpt'][:300]}...\n\n"
+            parts.append(
+                f"**Case {i}: {case['title']}**\n"
+                f"- Court: {case['court']}\n"
+                f"- Date: {case['date']}\n"
+                f"- Judges: {case['judges']}\n"
+                f"- Relevance: {case['relevance_score']:.2%}\n"
+                f"- Excerpt: {case['excerpt']}...\n\n"
+            )
         
-        return context
+        return ''.join(parts)
     
     def generate_response_openai(self, query: str, context: str) -> str:
         """Generate response using OpenAI GPT"""
         try:
-            import openai
-            
-            system_prompt = """You are an expert Indian legal assistant. 
-            Use the provided case precedents to answer questions accurately.
-            Always cite specific cases and rulings.
-            If uncertain, acknowledge limitations.
-            Provide clear, actionable legal guidance."""
+            openai = _get_openai()
             
             user_prompt = f"""Query: {query}
 
@@ -150,7 +221,7 @@ Based on the above precedents, provide a comprehensive legal answer with citatio
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,
@@ -161,25 +232,16 @@ Based on the above precedents, provide a comprehensive legal answer with citatio
             
         except Exception as e:
             print(f"❌ OpenAI generation error: {e}")
-            return "Error generating response."
+            return GENERATION_ERROR
     
     def generate_response_gemini(self, query: str, context: str) -> str:
         """Generate response using Google Gemini"""
         try:
-            prompt = f"""You are an expert Indian legal assistant with deep knowledge of Indian law.
-
-Query: {query}
+            # Fixed instructions first, then the per-query part
+            prompt = f"""{GEMINI_PROMPT_PREFIX}Query: {query}
 
 {context}
 
-Instructions:
-1. Analyze the provided case precedents carefully
-2. Provide a comprehensive legal answer citing specific cases
-3. Include relevant legal principles and precedents
-4. Mention applicable laws and sections if relevant
-5. Be clear, accurate, and professional
-6. If precedents are insufficient, acknowledge limitations
-
 Provide your expert legal analysis:"""
             
             response = self.model.generate_content(prompt)
@@ -187,7 +249,7 @@ Provide your expert legal analysis:"""
             
         except Exception as e:
             print(f"❌ Gemini generation error: {e}")
-            return "Error generating response."
+            return GENERATION_ERROR
     
     def answer_legal_query(self, query: str, top_k: int = 5) -> Dict:
         """
@@ -205,10 +267,24 @@ Provide your expert legal analysis:"""
         # Step 1: Retrieve relevant cases
         relevant_cases = self.retrieve_relevant_cases(query, top_k=top_k)
         
+        return self._answer_with_cases(query, relevant_cases)
+    
+    def _answer_with_cases(self, query: str, relevant_cases: List[Dict]) -> Dict:
+        """
+        Generate the answer for a query from already retrieved cases
+        
+        Args:
+            query: User's legal question
+            relevant_cases: Cases returned by retrieval
+            
+        Returns:
+            Dictionary with answer, sources, and metadata
+        """
         if not relevant_cases:
             return {
                 'answer': "I couldn't find relevant legal precedents for your query. Please try rephrasing or provide more context.",
                 'sources': [],
+                'generated': False,
                 'timestamp': datetime.now().isoformat()
             }
         
@@ -223,6 +299,10 @@ Provide your expert legal analysis:"""
         elif self.llm == 'gemini':
             answer = self.generate_response_gemini(query, context)
         else:
+            answer = None
+        
+        generated = answer is not None and answer != GENERATION_ERROR
+        if answer is None:
             answer = "LLM not initialized. Please check configuration."
         
         print("✅ Generated response with citations")
@@ -232,29 +312,34 @@ Provide your expert legal analysis:"""
             'answer': answer,
             'sources': relevant_cases,
             'query': query,
+            'generated': generated,
             'timestamp': datetime.now().isoformat()
         }
     
-    def batch_process_queries(self, queries: List[str], output_file: str = 'legal_qa_results.json'):
+    def batch_process_queries(self, queries: List[str], output_file: str = 'legal_qa_results.jsonl'):
         """
         Process multiple queries in batch
         
         Args:
             queries: List of legal questions
-            output_file: File to save results
+            output_file: JSON-lines file; each result is appended as soon as it is ready
         """
-        results = []
+        print(f"\n{'='*60}")
+        print(f"Processing {len(queries)} queries ({LLM_CONCURRENCY} at a time)")
         
-        for i, query in enumerate(queries, 1):
-            print(f"\n{'='*60}")
-            print(f"Processing query {i}/{len(queries)}")
-            
-            result = self.answer_legal_query(query)
-            results.append(result)
+        # Retrieve cases for every query with one batched embedding + search
+        all_cases = self.retrieve_relevant_cases_batch(queries)
         
-        # Save results
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # Each query mostly waits on the LLM API, so overlap them; map keeps query order
+        with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as executor, \
+                open(output_file, 'wb') as f:
+            for result in executor.map(self._answer_with_cases, queries, all_cases):
+                # One line per result, written while later answers are still generating
+                if orjson is not None:
+                    f.write(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE))
+                else:
+                    f.write(json.dumps(result, ensure_ascii=False).encode('utf-8') + b'\n')
+                f.flush()
         
         print(f"\n🎉 Batch processing complete! Results saved to {output_file}")
 
@@ -37,7 +37,7 @@ def load_cases_to_db():
     print(f"\n📊 Adding {len(cases)} cases to vector database...")
     print("⏱️  This will take 5-10 minutes...")
     
-    db.add_cases(cases, batch_size=50)
+    db.add_cases(cases, batch_size=250)
     
     print("\n" + "=" * 60)
     print("🎉 Successfully loaded all cases into vector database!")
@@ -1,40 +1,119 @@
 """
 Monitor the scraping progress and write status updates to a log file.
-Run this alongside your scraper; it will check the main JSON and partial files every 60s.
+Run this alongside your scraper; it will check the main JSON and partial files every 60s,
+or soon after they change when watchdog is installed.
 """
 
 import time
 import os
 import json
+import threading
 from datetime import datetime
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
 CASES_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'legal_cases')
 COMPLETE_FILE = os.path.join(CASES_DIR, 'indian_legal_cases_complete.json')
 LOG_FILE = os.path.join(CASES_DIR, 'scrape_status.log')
 
 CHECK_INTERVAL = 60  # seconds
+SETTLE_DELAY = 5  # seconds to let a burst of writes finish before re-checking
 
+# path -> ((mtime_ns, size), count); unchanged files are not re-read between checks
+_count_cache = {}
 
-def count_cases_in_file(path):
+
+def _count_cases(path):
+    if path.endswith('.jsonl'):
+        with open(path, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    if ijson is not None:
+        # Stream the top-level array instead of holding the whole file in memory
+        with open(path, 'rb') as f:
+            return sum(1 for _ in ijson.items(f, 'item'))
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+        if isinstance(data, list):
+            return len(data)
+        return 0
+
+
+def count_cases_in_file(path, stat=None):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return len(data)
-            return 0
+        if stat is None:
+            stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _count_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        count = _count_cases(path)
+        _count_cache[path] = (key, count)
+        return count
     except Exception:
         return 0
 
 
 def find_partial_files():
+    """Partial case files as os.DirEntry objects, oldest modification first
+    
+    Sorting by name would put cases_partial.jsonl (the live checkpoint)
+    before every cases_partial_N.json snapshot, and partial_10 before
+    partial_2.
+    """
     files = []
     try:
-        for fname in os.listdir(CASES_DIR):
-            if fname.startswith('cases_partial_') and fname.endswith('.json'):
-                files.append(fname)
+        with os.scandir(CASES_DIR) as entries:
+            for entry in entries:
+                if entry.name.startswith('cases_partial') and entry.name.endswith(('.json', '.jsonl')):
+                    files.append(entry)
     except Exception:
         pass
-    return sorted(files)
+    return sorted(files, key=lambda entry: entry.stat().st_mtime)
+
+
+def is_case_file(name):
+    return name == os.path.basename(COMPLETE_FILE) or (
+        name.startswith('cases_partial') and name.endswith(('.json', '.jsonl')))
+
+
+class CaseFileHandler(FileSystemEventHandler):
+    """Sets an event whenever a case file is created or modified"""
+    
+    def __init__(self, changed):
+        super().__init__()
+        self.changed = changed
+    
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved'):
+            return
+        path = getattr(event, 'dest_path', '') or event.src_path
+        if is_case_file(os.path.basename(path)):
+            self.changed.set()
+
+
+def start_watcher(changed):
+    """Watch CASES_DIR for case file changes; returns None without watchdog"""
+    if Observer is None:
+        return None
+    try:
+        observer = Observer()
+        observer.schedule(CaseFileHandler(changed), CASES_DIR, recursive=False)
+        observer.start()
+        return observer
+    except Exception as e:
+        print('File watching unavailable, polling instead:', e)
+        return None
 
 
 def write_log(message):
@@ -51,22 +130,31 @@ def get_status():
     complete_count = count_cases_in_file(COMPLETE_FILE)
     partials = find_partial_files()
     partial_info = []
-    for p in partials[-3:]:  # last 3 partials
-        path = os.path.join(CASES_DIR, p)
-        partial_info.append((p, os.path.getsize(path), count_cases_in_file(path)))
+    for entry in partials[-3:]:  # 3 most recently written partials
+        stat = entry.stat()
+        partial_info.append((entry.name, stat.st_size, count_cases_in_file(entry.path, stat)))
     return complete_count, partial_info
 
 
 if __name__ == '__main__':
     write_log('Monitor started')
     print('Scrape monitor started. Logging to', LOG_FILE)
+    # Wake early on case file changes; CHECK_INTERVAL stays as a heartbeat
+    changed = threading.Event()
+    observer = start_watcher(changed)
     try:
         while True:
             complete_count, partial_info = get_status()
             msg = f"Complete cases: {complete_count}; partials: {partial_info}"
             print(msg)
             write_log(msg)
-            time.sleep(CHECK_INTERVAL)
+            if changed.wait(CHECK_INTERVAL):
+                time.sleep(SETTLE_DELAY)
+                changed.clear()
     except KeyboardInterrupt:
         write_log('Monitor stopped by user')
         print('Monitor stopped')
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
@@ -6,12 +6,16 @@ Enhanced version with better performance and accuracy
 import os
 import json
 import time
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from datetime import datetime
 import numpy as np
 
 from vector_db import LegalVectorDatabase
 
+# Cosine similarity above which a new query reuses a cached query's results
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
 
 class OptimizedLegalRAG:
     """
@@ -31,10 +35,20 @@ class OptimizedLegalRAG:
         self.llm = None
         
         # Performance optimizations
-        self.query_cache = {}  # Cache for recent queries
-        self.embedding_cache = {}  # Cache for embeddings
+        self.embedding_cache = OrderedDict()  # LRU cache for embeddings, keyed by text
         self.max_cache_size = 100
         
+        # Semantic query cache: unit-normalized query embeddings with parallel
+        # (top_k, threshold) keys, retrieved cases and last-use ticks; allocated
+        # on first use, once the embedding dimension is known
+        self._cache_embs = None
+        self._cache_keys = []
+        self._cache_vals = []
+        self._cache_used = []
+        self._cache_tick = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         # Optimized parameters
         self.similarity_threshold = 0.3  # Lower threshold for better recall
         self.default_top_k = 5
@@ -86,19 +100,66 @@ class OptimizedLegalRAG:
             self.llm = 'fallback'
     
     def _get_cached_embedding(self, text: str) -> Optional[List[float]]:
-        """Get cached embedding if available"""
-        text_hash = hash(text)
-        return self.embedding_cache.get(text_hash)
+        """Get cached embedding if available, marking it most recently used"""
+        embedding = self.embedding_cache.get(text)
+        if embedding is not None:
+            self.embedding_cache.move_to_end(text)
+        return embedding
     
     def _cache_embedding(self, text: str, embedding: List[float]):
-        """Cache embedding for future use"""
-        if len(self.embedding_cache) >= self.max_cache_size:
-            # Remove oldest entry
-            oldest_key = next(iter(self.embedding_cache))
-            del self.embedding_cache[oldest_key]
-        
-        text_hash = hash(text)
-        self.embedding_cache[text_hash] = embedding
+        """Cache embedding for future use, evicting the least recently used"""
+        self.embedding_cache[text] = embedding
+        self.embedding_cache.move_to_end(text)
+        if len(self.embedding_cache) > self.max_cache_size:
+            self.embedding_cache.popitem(last=False)
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Embedding for a query, from the embedding cache when possible"""
+        embedding = self._get_cached_embedding(query)
+        if embedding is None:
+            embedding = self.vector_db.create_embeddings([query], use_openai=False)[0]
+            self._cache_embedding(query, embedding)
+        return embedding
+    
+    def _semantic_cache_get(self, q_emb: np.ndarray, key) -> Optional[List[Dict]]:
+        """Cached cases for the most similar earlier query with the same key, if close enough"""
+        n = len(self._cache_keys)
+        if n == 0:
+            return None
+        
+        # Cosine similarity to every cached query in one matrix-vector product
+        sims = self._cache_embs[:n] @ q_emb
+        sims[[k != key for k in self._cache_keys]] = -1.0
+        
+        best = int(sims.argmax())
+        if sims[best] >= SEMANTIC_CACHE_THRESHOLD:
+            self._cache_tick += 1
+            self._cache_used[best] = self._cache_tick
+            return self._cache_vals[best]
+        return None
+    
+    def _semantic_cache_put(self, q_emb: np.ndarray, key, cases: List[Dict]):
+        """Store retrieved cases, overwriting the least recently used slot once the cache is full"""
+        if self._cache_embs is None:
+            self._cache_embs = np.empty((self.max_cache_size, len(q_emb)), dtype=np.float32)
+        
+        self._cache_tick += 1
+        if len(self._cache_keys) < self.max_cache_size:
+            slot = len(self._cache_keys)
+            self._cache_keys.append(key)
+            self._cache_vals.append(cases)
+            self._cache_used.append(self._cache_tick)
+        else:
+            slot = min(range(self.max_cache_size), key=self._cache_used.__getitem__)
+            self._cache_keys[slot] = key
+            self._cache_vals[slot] = cases
+            self._cache_used[slot] = self._cache_tick
+        self._cache_embs[slot] = q_emb
+    
+    def cache_hit_rate(self) -> float:
+        """Fraction of retrievals served from the semantic query cache"""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
     
     def retrieve_relevant_cases(self, query: str, top_k: int = None) -> List[Dict]:
         """
@@ -115,15 +176,22 @@ class OptimizedLegalRAG:
             top_k = self.default_top_k
         
         try:
-            # Check cache first
-            cache_key = f"{query}_{top_k}"
-            if cache_key in self.query_cache:
+            # Check cache first; paraphrases of an earlier query count as hits
+            embedding = self._embed_query(query)
+            q_emb = np.asarray(embedding, dtype=np.float32)
+            q_emb /= max(float(np.linalg.norm(q_emb)), 1e-12)
+            
+            cache_key = (top_k, self.similarity_threshold)
+            cached = self._semantic_cache_get(q_emb, cache_key)
+            if cached is not None:
+                self.cache_hits += 1
                 print("🚀 Using cached results")
-                return self.query_cache[cache_key]
+                return cached
+            self.cache_misses += 1
             
             # Search vector database with optimized parameters
             start_time = time.time()
-            results = self.vector_db.search_similar_cases(query, top_k=top_k * 2)  # Get more results for filtering
+            results = self.vector_db.search_by_embedding(embedding, top_k=top_k * 2)  # Get more results for filtering
             search_time = time.time() - start_time
             
             # Filter results by similarity threshold and improve relevance scoring
@@ -153,12 +221,7 @@ class OptimizedLegalRAG:
             relevant_cases = relevant_cases[:top_k]
             
             # Cache results
-            if len(self.query_cache) >= self.max_cache_size:
-                # Remove oldest entry
-                oldest_key = next(iter(self.query_cache))
-                del self.query_cache[oldest_key]
-            
-            self.query_cache[cache_key] = relevant_cases
+            self._semantic_cache_put(q_emb, cache_key, relevant_cases)
             
             print(f"⚡ Search completed in {search_time:.2f}s, found {len(relevant_cases)} relevant cases")
             return relevant_cases
@@ -371,7 +434,8 @@ Based on the above precedents, provide a comprehensive legal answer with proper
                 'retrieval_time': retrieval_time,
                 'context_time': context_time,
                 'generation_time': generation_time,
-                'cache_hits': len([k for k in self.query_cache.keys() if query in k])
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses
             },
             'optimization_info': {
                 'similarity_threshold': self.similarity_threshold,
@@ -475,6 +539,8 @@ Based on the above precedents, provide a comprehensive legal answer with proper
         
         self.similarity_threshold = best_threshold
         print(f"\n✅ Optimized similarity threshold: {best_threshold} (score: {best_score:.2f})")
+        print(f"🚀 Query cache: {self.cache_hits} hits, {self.cache_misses} misses "
+              f"({self.cache_hit_rate():.1%} hit rate)")
         
         return best_threshold
 
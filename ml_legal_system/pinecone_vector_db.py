@@ -4,10 +4,48 @@ Replaces local ChromaDB with cloud-hosted Pinecone
 """
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
+import numpy as np
 from pinecone import Pinecone
 from sentence_transformers import SentenceTransformer
 
+try:
+    from urllib3.exceptions import HTTPError as TransportError
+except ImportError:
+    TransportError = ConnectionError
+
+# Parallel upsert workers sharing one Index instance, and retry policy per batch
+UPSERT_WORKERS = 8
+UPSERT_RETRIES = 5
+
+# Decimal places kept per vector component in REST (JSON) upserts
+EMBEDDING_DECIMALS = 6
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for rate limits (429), server errors (5xx) and connection failures"""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, (ConnectionError, TimeoutError, TransportError))
+
+
+def upsert_values(embeddings, json_transport: bool = True) -> List[List[float]]:
+    """
+    Convert embeddings to the value lists sent in a Pinecone upsert
+    
+    The REST client sends vectors as JSON text, where rounding (in float64)
+    to EMBEDDING_DECIMALS gives short literals instead of the full float32
+    expansion. The gRPC client packs values as float32, so rounding there
+    would save nothing and is skipped.
+    """
+    values = np.asarray(embeddings, dtype=np.float64)
+    if json_transport:
+        values = np.round(values, EMBEDDING_DECIMALS)
+    return values.tolist()
+
 class PineconeVectorDB:
     """
     Vector database using Pinecone cloud service
@@ -32,7 +70,7 @@ class PineconeVectorDB:
                 raise ValueError("PINECONE_API_KEY not found in environment variables")
             
             # Initialize Pinecone
-            self.pc = Pinecone(api_key=api_key)
+            self.pc = Pinecone(api_key=api_key, pool_threads=UPSERT_WORKERS)
             
             # Connect to index
             self.index = self.pc.Index(index_name)
@@ -48,7 +86,10 @@ class PineconeVectorDB:
     
     def create_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Create embeddings for texts using sentence-transformers
+        Create unit-length embeddings for texts using sentence-transformers
+        
+        Stored and query vectors are both normalized, so the index score is
+        cosine similarity whether its metric is 'cosine' or 'dotproduct'.
         
         Args:
             texts: List of texts to embed
@@ -57,7 +98,7 @@ class PineconeVectorDB:
             List of embedding vectors
         """
         try:
-            embeddings = self.model.encode(texts)
+            embeddings = self.model.encode(texts, normalize_embeddings=True)
             return embeddings.tolist()
         except Exception as e:
             print(f"❌ Error creating embeddings: {e}")
@@ -91,6 +132,9 @@ class PineconeVectorDB:
             if not embeddings:
                 return False
             
+            # This client uses the REST transport
+            embeddings = upsert_values(embeddings, json_transport=True)
+            
             # Prepare vectors for upsert
             vectors_to_upsert = []
             for i, doc_id in enumerate(ids):
@@ -103,18 +147,40 @@ class PineconeVectorDB:
                     'metadata': metadata
                 })
             
-            # Upsert to Pinecone in batches
+            # Upsert to Pinecone in parallel batches
             batch_size = 100
-            for i in range(0, len(vectors_to_upsert), batch_size):
-                batch = vectors_to_upsert[i:i + batch_size]
-                self.index.upsert(vectors=batch)
+            batches = [
+                vectors_to_upsert[i:i + batch_size]
+                for i in range(0, len(vectors_to_upsert), batch_size)
+            ]
+            
+            failed = 0
+            with ThreadPoolExecutor(max_workers=UPSERT_WORKERS) as executor:
+                futures = [executor.submit(self._upsert_with_retry, batch) for batch in batches]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed += 1
+                        print(f"❌ Upsert batch failed: {e}")
             
-            return True
+            return failed == 0
             
         except Exception as e:
             print(f"❌ Error adding documents: {e}")
             return False
     
+    def _upsert_with_retry(self, batch: List[Dict[str, Any]]):
+        """Upsert one batch, backing off exponentially on 429s, 5xx and connection errors"""
+        for attempt in range(UPSERT_RETRIES):
+            try:
+                return self.index.upsert(vectors=batch)
+            except Exception as e:
+                # Other errors (bad dimension, invalid metadata) fail the same way every time
+                if attempt == UPSERT_RETRIES - 1 or not is_retryable_error(e):
+                    raise
+                time.sleep(2 ** attempt)
+    
     def search(
         self,
         query: str,
@@ -134,7 +200,7 @@ class PineconeVectorDB:
         """
         try:
             # Generate query embedding
-            query_embedding = self.model.encode([query])[0].tolist()
+            query_embedding = self.model.encode([query], normalize_embeddings=True)[0].tolist()
             
             # Search Pinecone
             results = self.index.query(
@@ -9,6 +9,33 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 import numpy as np
 
+# Opt-in int8 weights for the local embedding model on CPU. Stored vectors
+# (ChromaDB, Pinecone) are fp32, so check retrieval overlap with
+# `python optimize_performance.py --compare-int8` before enabling it
+QUANTIZE_EMBEDDINGS = os.getenv('QUANTIZE_EMBEDDINGS', 'false').lower() == 'true'
+
+
+def load_embeddings_model(model_name: str = 'all-MiniLM-L6-v2', quantize: bool = None):
+    """Load a sentence-transformers model, int8-quantized on CPU when enabled"""
+    from sentence_transformers import SentenceTransformer
+    
+    if quantize is None:
+        quantize = QUANTIZE_EMBEDDINGS
+    
+    model = SentenceTransformer(model_name)
+    
+    if quantize and model.device.type == 'cpu':
+        try:
+            import torch
+            
+            # Dynamic quantization: Linear weights stored as int8, activations
+            # quantized per batch; uses the CPU's int8 dot-product kernels
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            print(f"⚠️ int8 quantization unavailable, using fp32 embeddings: {e}")
+    
+    return model
+
 @dataclass
 class LegalCase:
     """Data class for a legal case"""
@@ -95,13 +122,15 @@ class LegalVectorDatabase:
             print(f"❌ Error initializing ChromaDB: {e}")
             raise
     
-    def create_embeddings(self, texts: List[str], use_openai: bool = True) -> List[List[float]]:
+    def create_embeddings(self, texts: List[str], use_openai: bool = True,
+                          batch_size: int = 32) -> List[List[float]]:
         """
         Create embeddings for text using OpenAI or free alternatives
         
         Args:
             texts: List of texts to embed
             use_openai: If True, use OpenAI. Otherwise use sentence-transformers
+            batch_size: Texts per forward pass for local embeddings
             
         Returns:
             List of embedding vectors
@@ -109,7 +138,7 @@ class LegalVectorDatabase:
         if use_openai:
             return self._create_openai_embeddings(texts)
         else:
-            return self._create_local_embeddings(texts)
+            return self._create_local_embeddings(texts, batch_size=batch_size)
     
     def _create_openai_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Create embeddings using OpenAI API"""
@@ -140,16 +169,16 @@ class LegalVectorDatabase:
             print("💡 Falling back to local embeddings")
             return self._create_local_embeddings(texts)
     
-    def _create_local_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def _create_local_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
         """Create embeddings using sentence-transformers (free)"""
         try:
-            from sentence_transformers import SentenceTransformer
-            
-            # Use a legal-domain model if available, otherwise general model
-            model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Load the model once and reuse it for every later call
+            if self.embeddings_model is None:
+                # Use a legal-domain model if available, otherwise general model
+                self.embeddings_model = load_embeddings_model('all-MiniLM-L6-v2')
             
             print("🔄 Creating local embeddings...")
-            embeddings = model.encode(texts, show_progress_bar=True)
+            embeddings = self.embeddings_model.encode(texts, batch_size=batch_size, show_progress_bar=True)
             
             return embeddings.tolist()
             
@@ -157,79 +186,81 @@ class LegalVectorDatabase:
             print(f"❌ Local embedding error: {e}")
             raise
     
-    def add_cases(self, cases: List[Dict], batch_size: int = 100):
+    def add_cases(self, cases: List[Dict], batch_size: int = 250):
         """
         Add cases to vector database
         
         Args:
             cases: List of case dictionaries from scraper
-            batch_size: Number of cases to process at once
+            batch_size: Number of cases written per database add/upsert
         """
         print(f"📚 Adding {len(cases)} cases to vector database...")
+        if not cases:
+            return
         
-        for i in range(0, len(cases), batch_size):
-            batch = cases[i:i+batch_size]
+        # Prepare texts for embedding
+        texts = []
+        metadatas = []
+        ids = []
+        
+        for idx, case in enumerate(cases):
+            # Create searchable text from full_text and search_query
+            full_text = case.get('full_text', '')
+            search_query = case.get('search_query', '')
+            case_text = f"{search_query} {full_text}"
+            texts.append(case_text)
             
-            # Prepare texts for embedding
-            texts = []
-            metadatas = []
-            ids = []
+            # Extract title from full_text (first line or first 100 chars)
+            title = ''
+            if full_text:
+                lines = full_text.split('\n')
+                # Find the first meaningful line (not just whitespace or common headers)
+                for line in lines:
+                    line = line.strip()
+                    if line and len(line) > 10 and 'Virtual Legal Assistant' not in line:
+                        title = line[:100]
+                        break
+                if not title:
+                    title = full_text[:100].strip()
             
-            for j, case in enumerate(batch):
-                # Create searchable text from full_text and search_query
-                full_text = case.get('full_text', '')
-                search_query = case.get('search_query', '')
-                case_text = f"{search_query} {full_text}"
-                texts.append(case_text)
-                
-                # Extract title from full_text (first line or first 100 chars)
-                title = ''
-                if full_text:
-                    lines = full_text.split('\n')
-                    # Find the first meaningful line (not just whitespace or common headers)
-                    for line in lines:
-                        line = line.strip()
-                        if line and len(line) > 10 and 'Virtual Legal Assistant' not in line:
-                            title = line[:100]
-                            break
-                    if not title:
-                        title = full_text[:100].strip()
-                
-                # Store metadata with available fields
-                metadatas.append({
-                    'title': title,
-                    'court': '',  # Not available in scraped data
-                    'date': '',   # Not available in scraped data
-                    'judges': '', # Not available in scraped data
-                    'url': case.get('url', ''),
-                    'search_query': search_query,
-                    'scraped_at': case.get('scraped_at', ''),
-                    'legal_acts': json.dumps(case.get('legal_acts', [])),
-                    'citations': json.dumps(case.get('citations', []))
-                })
-                
-                # Generate ID
-                ids.append(f"case_{i+j}")
+            # Store metadata with available fields
+            metadatas.append({
+                'title': title,
+                'court': '',  # Not available in scraped data
+                'date': '',   # Not available in scraped data
+                'judges': '', # Not available in scraped data
+                'url': case.get('url', ''),
+                'search_query': search_query,
+                'scraped_at': case.get('scraped_at', ''),
+                'legal_acts': json.dumps(case.get('legal_acts', [])),
+                'citations': json.dumps(case.get('citations', []))
+            })
             
-            # Create embeddings
-            embeddings = self.create_embeddings(texts, use_openai=False)
+            # Generate ID
+            ids.append(f"case_{idx}")
+        
+        # Embed everything in one pass, decoupled from the database writes
+        embeddings = self.create_embeddings(texts, use_openai=False, batch_size=128)
+        
+        total_batches = (len(cases) - 1) // batch_size + 1
+        for i in range(0, len(cases), batch_size):
+            end = i + batch_size
             
             # Add to database
             if self.use_cloud:
                 # Pinecone format
-                vectors = [(ids[k], embeddings[k], metadatas[k]) 
-                          for k in range(len(ids))]
+                vectors = list(zip(ids[i:end], embeddings[i:end], metadatas[i:end]))
                 self.index.upsert(vectors=vectors)
             else:
-                # ChromaDB format
+                # ChromaDB format; each add is one SQLite transaction, so fewer, larger adds
                 self.collection.add(
-                    documents=texts,
-                    embeddings=embeddings,
-                    metadatas=metadatas,
-                    ids=ids
+                    documents=texts[i:end],
+                    embeddings=embeddings[i:end],
+                    metadatas=metadatas[i:end],
+                    ids=ids[i:end]
                 )
             
-            print(f"✅ Added batch {i//batch_size + 1}/{(len(cases)-1)//batch_size + 1}")
+            print(f"✅ Added batch {i//batch_size + 1}/{total_batches}")
         
         print(f"🎉 Successfully added {len(cases)} cases to vector database!")
     
@@ -249,6 +280,21 @@ class LegalVectorDatabase:
         # Create query embedding
         query_embedding = self.create_embeddings([query], use_openai=False)[0]
         
+        return self.search_by_embedding(query_embedding, top_k=top_k, filters=filters)
+    
+    def search_by_embedding(self, query_embedding: List[float], top_k: int = 10,
+                            filters: Dict = None) -> List[Dict]:
+        """
+        Search for similar cases with a precomputed query embedding
+        
+        Args:
+            query_embedding: Embedding vector for the query
+            top_k: Number of results to return
+            filters: Optional filters (court, date range, etc.)
+            
+        Returns:
+            List of relevant cases with similarity scores
+        """
         if self.use_cloud:
             # Pinecone search
             results = self.index.query(
@@ -272,16 +318,74 @@ class LegalVectorDatabase:
                 where=filters
             )
             
-            similar_cases = []
-            for i in range(len(results['ids'][0])):
-                similar_cases.append({
-                    'id': results['ids'][0][i],
-                    'document': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i]
-                })
+            return self._chroma_matches(results, 0)
+    
+    def search_similar_cases_batch(self, queries: List[str], top_k: int = 10,
+                                   filters: Dict = None) -> List[List[Dict]]:
+        """
+        Search for similar cases for several queries at once
+        
+        All queries are embedded in one batched call; ChromaDB then answers
+        them in a single query request.
+        
+        Args:
+            queries: User's legal queries
+            top_k: Number of results to return per query
+            filters: Optional filters (court, date range, etc.)
+            
+        Returns:
+            One list of relevant cases per query, in query order
+        """
+        if not queries:
+            return []
+        
+        query_embeddings = self.create_embeddings(queries, use_openai=False)
+        
+        return self.search_by_embeddings_batch(query_embeddings, top_k=top_k, filters=filters)
+    
+    def search_by_embeddings_batch(self, query_embeddings: List[List[float]], top_k: int = 10,
+                                   filters: Dict = None) -> List[List[Dict]]:
+        """
+        Search for similar cases with several precomputed query embeddings
+        
+        Args:
+            query_embeddings: One embedding vector per query
+            top_k: Number of results to return per query
+            filters: Optional filters (court, date range, etc.)
             
-            return similar_cases
+        Returns:
+            One list of relevant cases per embedding, in input order
+        """
+        if len(query_embeddings) == 0:
+            return []
+        
+        if self.use_cloud:
+            # Pinecone answers one vector per request
+            return [self.search_by_embedding(embedding, top_k=top_k, filters=filters)
+                    for embedding in query_embeddings]
+        
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=top_k,
+            where=filters
+        )
+        
+        return [self._chroma_matches(results, row) for row in range(len(query_embeddings))]
+    
+    @staticmethod
+    def _chroma_matches(results: Dict, row: int) -> List[Dict]:
+        """Convert one query's row of a ChromaDB query result into case dicts"""
+        return [{
+            'id': case_id,
+            'document': document,
+            'metadata': metadata,
+            'distance': distance
+        } for case_id, document, metadata, distance in zip(
+            results['ids'][row],
+            results['documents'][row],
+            results['metadatas'][row],
+            results['distances'][row]
+        )]
     
     def get_case_by_id(self, case_id: str) -> Optional[Dict]:
         """Retrieve a specific case by ID"""